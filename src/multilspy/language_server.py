@@ -6,22 +6,30 @@ The details of Language Specific configuration are not exposed to the user.
 """
 
 import asyncio
+import bisect
+import concurrent.futures
+import copy
 import dataclasses
 import hashlib
-import json
+import itertools
 import logging
 import os
 import pathlib
 import pickle
 import re
+import sqlite3
+import stat
 import threading
-from collections import defaultdict
+import time
+import urllib.parse
+import zlib
+from collections import OrderedDict, defaultdict
 from contextlib import asynccontextmanager, contextmanager
-from copy import copy
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple, Union
 from fnmatch import fnmatch
 from pathlib import Path, PurePath
-from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union, cast
+from typing import AsyncIterator, Awaitable, Callable, Dict, Hashable, Iterator, List, Optional, Tuple, Union, cast
 
 import pathspec
 
@@ -57,6 +65,74 @@ from multilspy.lsp_protocol_handler import lsp_types
 
 GenericDocumentSymbol = Union[LSPTypes.DocumentSymbol, LSPTypes.SymbolInformation, multilspy_types.UnifiedSymbolInformation]
 
+
+def _flatten_symbol_tree(root: GenericDocumentSymbol, result_list: List[multilspy_types.UnifiedSymbolInformation]) -> None:
+    """
+    Appends the nodes of the symbol tree with the given root to the given list in pre-order (parents before their children).
+    The traversal is iterative, such that deeply nested trees do not hit the recursion limit.
+    """
+    stack = [root]
+    while stack:
+        node = cast(multilspy_types.UnifiedSymbolInformation, stack.pop())
+        result_list.append(node)
+        children = node.get(LSPConstants.CHILDREN)
+        if children:
+            # pushed in reverse order, such that the children are visited in their original order
+            stack.extend(reversed(children))
+
+
+def _compile_fused_ignore_regex(spec: pathspec.PathSpec) -> Optional[re.Pattern]:
+    """
+    Fuses the patterns of the given path spec into a single regular expression, such that a path can be
+    matched in one pass instead of iterating over all patterns (as done by `PathSpec.match_file`).
+
+    :param spec: the path spec with gitignore-style patterns
+    :return: the compiled regex, or None if the patterns cannot be fused (which is the case if
+        negation patterns are present, since for these the order of the patterns matters)
+    """
+    regexes = []
+    for pattern in spec.patterns:
+        if pattern.include is None:  # null-operation pattern (e.g. a comment)
+            continue
+        if not pattern.include or not isinstance(pattern, pathspec.pattern.RegexPattern):
+            return None
+        # the patterns contain a named group (`ps_d`), which may only occur once in the fused regex
+        regexes.append(pattern.regex.pattern.replace("(?P<ps_d>", "(?:"))
+    if not regexes:
+        return None
+    return re.compile("|".join(f"(?:{regex})" for regex in regexes))
+
+@lru_cache(maxsize=64)
+def _build_ignore_matchers(patterns: Tuple[str, ...]) -> Tuple[pathspec.PathSpec, Optional[re.Pattern]]:
+    """
+    Builds the path spec for the given gitignore-style patterns along with its fused regex (see `_compile_fused_ignore_regex`).
+    The result is cached, such that language servers created for the same repository share the compiled matchers.
+
+    :param patterns: the patterns; the order matters for negation patterns
+    """
+    spec = pathspec.PathSpec.from_lines(pathspec.patterns.GitWildMatchPattern, patterns)
+    return spec, _compile_fused_ignore_regex(spec)
+
+
+@lru_cache(maxsize=8192)
+def _absolute_file_path(repository_root_path: str, relative_file_path: str) -> str:
+    """
+    Joins the given paths to a normalized absolute path (as `str(PurePath(repository_root_path, relative_file_path))`).
+    """
+    return str(PurePath(repository_root_path, relative_file_path))
+
+
+@lru_cache(maxsize=8192)
+def _file_uri(absolute_file_path: str) -> str:
+    """
+    Converts a normalized absolute file path to a file URI, producing the same result as `Path.as_uri()`
+    without the construction of a path object.
+    """
+    if os.name != "nt":
+        return "file://" + urllib.parse.quote_from_bytes(os.fsencode(absolute_file_path))
+    return pathlib.Path(absolute_file_path).as_uri()
+
+
 @dataclasses.dataclass
 class LSPFileBuffer:
     """
@@ -80,10 +156,99 @@ class LSPFileBuffer:
 
     # --------------------------------- MODIFICATIONS BY MISCHA ---------------------------------
 
-    content_hash: str = ""
+    # (mtime_ns, size) of the file at the time the contents were read, used for detecting changes on disk
+    stat_signature: Optional[Tuple[int, int]] = None
+
+    # hash of the contents, computed on first access (see content_hash); must be reset when the contents change
+    _content_hash: Optional[str] = dataclasses.field(default=None, init=False, repr=False)
+
+    # lines of the contents, computed on first access (see lines); must be reset when the contents change
+    _lines: Optional[List[str]] = dataclasses.field(default=None, init=False, repr=False)
+
+    @property
+    def content_hash(self) -> str:
+        if self._content_hash is None:
+            # The hash is only used for detecting content changes (cache invalidation), not for security.
+            # SHA-1 is hardware-accelerated (SHA-NI) in OpenSSL on most CPUs and thus considerably faster than MD5.
+            self._content_hash = hashlib.sha1(self.contents.encode('utf-8'), usedforsecurity=False).hexdigest()
+        return self._content_hash
+
+    @property
+    def lines(self) -> List[str]:
+        """
+        The lines of the contents (split at "\n"). The list is shared and must not be modified.
+        """
+        if self._lines is None:
+            self._lines = self.contents.split("\n")
+        return self._lines
+
+    def get_first_lines(self, num_lines: int) -> List[str]:
+        """
+        Returns the first num_lines lines of the contents (fewer if the contents have fewer lines).
+        Unless the lines were already computed, only the required prefix of the contents is split.
+        """
+        if self._lines is not None:
+            return self._lines[:num_lines]
+        return self.contents.split("\n", num_lines)[:num_lines]
+
+
+class _ContainingSymbolIndex:
+    """
+    An index of the candidate container symbols of a file (see `LanguageServer.request_containing_symbol`), which are sorted
+    by their start line, such that the innermost container of a position is found without scanning all candidates.
+    """
+
+    def __init__(self, candidate_containers: List[multilspy_types.UnifiedSymbolInformation]):
+        """
+        :param candidate_containers: the candidates, which must have a location with a range; among candidates with the same
+            start line, the earliest one is preferred
+        """
+        # the sort is stable, so candidates with the same start line retain their order
+        self._symbols = sorted(candidate_containers, key=lambda s: s["location"]["range"]["start"]["line"])
+        self._start_lines = [s["location"]["range"]["start"]["line"] for s in self._symbols]
+        # the maximum end line of all symbols up to the respective index, which bounds the backward search
+        self._max_end_lines = list(itertools.accumulate((s["location"]["range"]["end"]["line"] for s in self._symbols), max))
+
+    def find_innermost_container(self, line: int, column: Optional[int], strict: bool) -> Optional[multilspy_types.UnifiedSymbolInformation]:
+        """
+        :return: the containing candidate with the greatest start line, or None if no candidate contains the position
+        """
+        symbols, start_lines, max_end_lines = self._symbols, self._start_lines, self._max_end_lines
+        # the candidates which start at or before the line (strictly before if strict)
+        end_index = bisect.bisect_left(start_lines, line) if strict else bisect.bisect_right(start_lines, line)
+        result = None
+        result_start_line = -1
+        for i in range(end_index - 1, -1, -1):
+            if max_end_lines[i] < line:
+                break  # none of the remaining candidates extends to the line
+            start_line = start_lines[i]
+            if start_line < result_start_line:
+                break  # the remaining candidates start earlier than the container found
+            symbol = symbols[i]
+            symbol_range = symbol["location"]["range"]
+            if symbol_range["end"]["line"] < line:
+                continue
+            if column is not None:
+                start_column = symbol_range["start"]["character"]
+                if column < start_column or (strict and column == start_column):
+                    continue
+            # the search is backwards, so this is the earliest candidate with this start line so far
+            result = symbol
+            result_start_line = start_line
+        return result
+
+
+@dataclasses.dataclass
+class _InFlightRequest:
+    """
+    A request which is currently awaited by one or more callers (see `LanguageServer._send_coalesced_request`).
+    """
 
-    def __post_init__(self):
-        self.content_hash = hashlib.md5(self.contents.encode('utf-8')).hexdigest()
+    # the pending response
+    future: asyncio.Future
+
+    # the number of callers awaiting the response
+    num_callers: int = 1
 
 
 class LanguageServer:
@@ -92,6 +257,66 @@ class LanguageServer:
     It is used to communicate with Language Servers of different programming languages.
     """
 
+    max_lingering_file_buffers = 0
+    """
+    The maximum number of unmodified files which are kept open in the Language Server after they are no longer in use,
+    saving the didOpen/didClose notifications when the same files are requested repeatedly.
+    Disabled by default, since some servers (e.g. pyright) perform a full analysis of all open files,
+    which can outweigh the savings.
+    """
+
+    max_concurrent_symbol_requests = 32
+    """
+    The maximum number of document symbol requests which are in flight concurrently when requesting the symbols of many files
+    (e.g. when building the full symbol tree).
+    """
+
+    max_concurrent_file_reads = 16
+    """
+    The maximum number of files which are read concurrently (by threads) when searching the files for a pattern.
+    """
+
+    max_cached_ignored_paths = 100000
+    """
+    The maximum number of decisions of `is_ignored_path` that are memoized (the least recently used ones are discarded).
+    Read when the instance is created.
+    """
+
+    max_cached_file_contents = 64
+    """
+    The maximum number of contents of files (which are not open) that are kept in memory, such that repeated reads of the same
+    files (e.g. for retrieving the bodies of several symbols) are served without reading them from disk again.
+    """
+
+    max_cached_document_symbols = 10000
+    """
+    The maximum number of entries of the document symbols cache which are held in memory; the least recently used entries
+    are evicted (unsaved entries only after they were saved in the background) and are loaded from the persistent cache
+    again when they are requested.
+    """
+
+    max_persisted_document_symbols = 100000
+    """
+    The maximum number of entries in the persistent document symbols cache; the least recently used entries are evicted when saving.
+    """
+
+    _document_symbols_cache_version = 3
+    """
+    The version of the format of the persistent document symbols cache, which is part of the file name, such that
+    caches written in an incompatible format are not read.
+    """
+
+    _document_symbols_cache_mmap_size = 256 * 1024 * 1024
+    """
+    The maximum number of bytes of the persistent document symbols cache that SQLite accesses through a memory map.
+    """
+
+    _document_symbols_cache_compression_level = 3
+    """
+    The zlib compression level of the pickled entries of the persistent document symbols cache. The symbol data is highly
+    repetitive, such that a low level already reduces the size of the cache about sixfold at a small cost for saving.
+    """
+
     # To be overridden and extended by subclasses
     def is_ignored_dirname(self, dirname: str) -> bool:
         """
@@ -116,7 +341,7 @@ class LanguageServer:
 
         :return LanguageServer: A language specific LanguageServer instance.
         """
-        config = copy(config)  # prevent mutation
+        config = dataclasses.replace(config)  # prevent mutation
         if add_gitignore_content_to_config:
             gitignore_path = os.path.join(repository_root_path, ".gitignore")
             if not os.path.exists(gitignore_path):
@@ -130,8 +355,11 @@ class LanguageServer:
                     raise ValueError(
                         f"Asked to add gitignore content to the config for {repository_root_path=} but there already is a non-empty entry"
                     )
+                # only the pattern lines are relevant (see __init__), so comments and blank lines are dropped while reading
                 with open(gitignore_path) as f:
-                    gitignore_file_content = f.read()
+                    gitignore_file_content = "\n".join(
+                        line.strip() for line in f if not line.startswith('#') and line.strip() != ''
+                    )
             config.gitignore_file_content = gitignore_file_content
 
         if config.code_language == Language.PYTHON:
@@ -250,13 +478,40 @@ class LanguageServer:
 
         self.language_id = language_id
         self.open_file_buffers: Dict[str, LSPFileBuffer] = {}
+        self._lingering_file_buffer_uris: "OrderedDict[str, None]" = OrderedDict()
+        """URIs of unmodified buffers which are no longer referenced but kept open (least recently used first)"""
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        """The event loop on which the server runs (set while it is started), on which the lingering buffers are managed"""
+        self._in_flight_requests: Dict[Hashable, _InFlightRequest] = {}
+        """Maps the keys of the requests which are currently awaited (see `_send_coalesced_request`) to the pending requests"""
 
         # --------------------------------- MODIFICATIONS BY ORAIOS ---------------------------------
-        self._document_symbols_cache:  dict[str, Tuple[str, Tuple[List[multilspy_types.UnifiedSymbolInformation], List[multilspy_types.UnifiedSymbolInformation]]]] = {}
-        """Maps file paths to a tuple of (file_content_hash, result_of_request_document_symbols)"""
+        self._document_symbols_cache: "OrderedDict[str, Tuple[str, Tuple[List[multilspy_types.UnifiedSymbolInformation], List[multilspy_types.UnifiedSymbolInformation]]]]" = OrderedDict()
+        """Maps file paths to a tuple of (file_content_hash, result_of_request_document_symbols).
+        Holds the (at most max_cached_document_symbols) entries which were used most recently in this session (least recently
+        used first); the persistent cache is queried lazily on a miss."""
+        self._cache_stat_signatures: dict[str, Optional[Tuple[int, int]]] = {}
+        """Maps the keys of _document_symbols_cache to the stat signature of the file the entry was computed for
+        (None if unknown), which allows validating an entry without hashing the file contents"""
+        self._containing_symbol_indices: dict[str, Tuple[List[multilspy_types.UnifiedSymbolInformation], _ContainingSymbolIndex]] = {}
+        """Maps the keys of _document_symbols_cache to the tuple (symbols, index), where the index was built from the given
+        document symbols (as returned by request_document_symbols); the index is rebuilt when the document symbols change"""
+        self._cache_connection: Optional[sqlite3.Connection] = None
+        self._cache_lock = threading.Lock()
+        self._file_contents_cache: "OrderedDict[str, Tuple[Tuple[int, int], str, Optional[List[str]]]]" = OrderedDict()
+        """Maps the absolute paths of recently read files to the tuple (stat_signature, contents, lines), least recently used first,
+        where the lines are only computed when first requested (see `_read_file_content` and `_read_file_lines`)"""
+        self._file_contents_cache_lock = threading.Lock()
+        self._dirty_cache_keys: set[str] = set()
+        """Keys of the entries in _document_symbols_cache which were added or updated since the last save"""
+        self._used_cache_keys: set[str] = set()
+        """Keys of the entries which were loaded from the persistent cache since the last save (for updating their last use)"""
+        self._flushing_cache_keys: set[str] = set()
+        """Keys of the entries which are currently being written to the persistent cache (see `_flush_cache`)"""
+        self._cache_flush_task: Optional[asyncio.Task] = None
         self.load_cache()
-        self._cache_has_changed = bool
         self.language = Language(language_id)
+        self._source_fn_matcher = self.language.get_source_fn_matcher()
         
         # Create the URI-to-Path mapper with caching
         self._path_mapper = UriPathMapper(self.repository_root_path, self.logger)
@@ -264,7 +519,9 @@ class LanguageServer:
         # Set up the pathspec matcher for the ignored paths
         # for all absolute paths in ignored_paths, convert them to relative paths
         processed_patterns = []
-        for pattern in set(config.ignored_paths):
+        # duplicates are removed while preserving the order, which matters for negation patterns and makes the
+        # patterns (and thus the key for sharing the compiled matchers, see _build_ignore_matchers) deterministic
+        for pattern in dict.fromkeys(config.ignored_paths):
             # Normalize separators (pathspec expects forward slashes)
             pattern = pattern.replace(os.path.sep, '/')
             processed_patterns.append(pattern)
@@ -275,10 +532,17 @@ class LanguageServer:
                     processed_patterns.append(line.strip())
 
         # Create a pathspec matcher from the processed patterns
-        self._ignore_spec = pathspec.PathSpec.from_lines(
-            pathspec.patterns.GitWildMatchPattern,
-            processed_patterns
-        )
+        self._ignore_spec, self._ignore_regex = _build_ignore_matchers(tuple(processed_patterns))
+        self._ignore_spec_has_negations = any(pattern.include is False for pattern in self._ignore_spec.patterns)
+        """Whether the ignore spec contains negation patterns, in which case a path within an ignored directory may not be ignored"""
+        self._is_ignored_path_of_type_cached = lru_cache(maxsize=self.max_cached_ignored_paths)(self._is_ignored_path_of_type)
+        """Memoized variant of `_is_ignored_path_of_type`. The ignore conditions are fixed for the lifetime of the instance (the
+        .gitignore content is read once on creation), so the decision for a path of a given file type can be reused"""
+        self._ignored_dir_cache: dict[str, bool] = {}
+        """Maps relative directory paths (with forward slashes) to whether the directory is ignored"""
+        self._ignored_dirname_cache: dict[str, bool] = {}
+        """Maps directory names to the result of is_ignored_dirname"""
+        self._has_default_ignored_dirname_condition = type(self).is_ignored_dirname is LanguageServer.is_ignored_dirname
 
     def handle_publish_diagnostics(self, params: Dict[str, Any]) -> None:
         """
@@ -289,22 +553,15 @@ class LanguageServer:
         try:
             uri = params.get("uri", "")
             diagnostics = params.get("diagnostics", [])
-            
-            # Convert URI to relative path
-            import urllib.parse
-            from pathlib import Path
-            
-            uri_path = urllib.parse.unquote(uri.replace("file://", ""))
-            repo_root = self.repository_root_path
-            
-            # Handle potential path differences between URI and repo root
-            try:
-                relative_path = os.path.relpath(uri_path, repo_root)
+
+            # the notifications can be frequent, and the path mapper caches the conversion per URI
+            relative_path = self._path_mapper.uri_to_relative_path(uri)
+            if relative_path is not None:
                 # Store the diagnostics
                 self._diagnostics_store[relative_path] = diagnostics
                 self.logger.log(f"Stored {len(diagnostics)} diagnostics for {relative_path}", logging.INFO)
-            except ValueError:
-                self.logger.log(f"URI path {uri_path} is not relative to repo root {repo_root}", logging.INFO)
+            else:
+                self.logger.log(f"URI {uri} is not relative to repo root {self.repository_root_path}", logging.INFO)
         except Exception as e:
             self.logger.log(f"Error handling diagnostics notification: {e}", logging.INFO)
 
@@ -354,43 +611,87 @@ class LanguageServer:
         :return: True if the path should be ignored, False otherwise
         """
         abs_path = os.path.join(self.repository_root_path, relative_path)
-        if not os.path.exists(abs_path):
+        # a single stat call provides both the existence check and the file type, which is part of the memoization key,
+        # such that a path which was deleted or replaced by one of another type is not decided based on a stale entry
+        try:
+            st_mode = os.stat(abs_path).st_mode
+        except FileNotFoundError:
             raise FileNotFoundError(f"File {abs_path} not found, the ignore check cannot be performed")
+        return self._is_ignored_path_of_type_cached(
+            relative_path, ignore_unsupported_files, stat.S_ISREG(st_mode), stat.S_ISDIR(st_mode)
+        )
+
+    def _is_ignored_dirname_cached(self, dirname: str) -> bool:
+        # the number of distinct directory names in a repository is small, and the language-specific
+        # condition is a pure function of the name, so the result is memoized
+        is_ignored = self._ignored_dirname_cache.get(dirname)
+        if is_ignored is None:
+            is_ignored = self.is_ignored_dirname(dirname)
+            self._ignored_dirname_cache[dirname] = is_ignored
+        return is_ignored
+
+    def _is_ignored_dir_entry(self, relative_path: str, dir_entry: os.DirEntry) -> bool:
+        """
+        Variant of `is_ignored_path` (with ignore_unsupported_files=True) for an entry obtained from `os.scandir`,
+        whose file type is known without a further stat call.
+
+        :param relative_path: the relative path of the entry
+        :param dir_entry: the directory entry
+        """
+        return self._is_ignored_path_of_type_cached(relative_path, True, dir_entry.is_file(), dir_entry.is_dir())
+
+    def _is_ignored_path_of_type(self, relative_path: str, ignore_unsupported_files: bool, is_file: bool, is_dir: bool) -> bool:
+        abs_path = os.path.join(self.repository_root_path, relative_path)
 
         # Check file extension if it's a file
-        is_file = os.path.isfile(abs_path)
         if is_file and ignore_unsupported_files:
-            fn_matcher = self.language.get_source_fn_matcher()
-            if not fn_matcher.is_relevant_filename(abs_path):
+            if not self._source_fn_matcher.is_relevant_filename(abs_path):
                 return True
 
         # Create normalized path for consistent handling
-        rel_path = Path(relative_path)
-
-        # Check each part of the path against always fulfilled ignore conditions
-        dir_parts = rel_path.parts
-        if is_file:
-            dir_parts = dir_parts[:-1]
-        for part in dir_parts:
-            if not part:  # Skip empty parts (e.g., from leading '/')
-                continue
-            if self.is_ignored_dirname(part):
+        # Normalize path separators for pathspec (it expects forward slashes)
+        normalized_path = os.path.normpath(relative_path).replace(os.path.sep, '/')
+
+        # Check each directory along the path against always fulfilled ignore conditions
+        dir_path = normalized_path if is_dir else normalized_path.rpartition('/')[0]
+        dir_path = "" if dir_path == "." else dir_path.lstrip('/')
+        if self._has_default_ignored_dirname_condition:
+            # the default condition (names starting with '.') can be checked for all directories in a single scan
+            if "/." in "/" + dir_path:
                 return True
+        else:
+            # Directories which were already checked are looked up in the cache: an ignored ancestor
+            # directory short-circuits the check for all of its descendants.
+            ancestor_path = ""
+            for part in dir_path.split('/'):
+                if not part:  # Skip empty parts
+                    continue
+                ancestor_path = f"{ancestor_path}/{part}" if ancestor_path else part
+                is_ignored_dir = self._ignored_dir_cache.get(ancestor_path)
+                if is_ignored_dir is None:
+                    if self._is_ignored_dirname_cached(part):
+                        self._ignored_dir_cache[ancestor_path] = True
+                        return True
+                elif is_ignored_dir:
+                    return True
 
         # Use pathspec for gitignore-style pattern matching
-        # Normalize path separators for pathspec (it expects forward slashes)
-        normalized_path = str(rel_path).replace(os.path.sep, '/')
 
         # pathspec can't handle the matching of directories if they don't end with a slash!
         # see https://github.com/cpburnz/python-pathspec/issues/89
-        if os.path.isdir(os.path.join(self.repository_root_path, normalized_path)) and not normalized_path.endswith('/'):
+        if is_dir and not normalized_path.endswith('/'):
             normalized_path = normalized_path + '/'
 
         # Use the pathspec matcher to check if the path matches any ignore pattern
-        if self._ignore_spec.match_file(normalized_path):
-            return True
-
-        return False
+        if self._ignore_regex is not None:
+            is_ignored = self._ignore_regex.match(pathspec.util.normalize_file(normalized_path)) is not None
+        else:
+            is_ignored = self._ignore_spec.match_file(normalized_path)
+        # the decision for a directory applies to all of its descendants (see above) only if no negation pattern
+        # can re-include a path within it
+        if is_dir and dir_path and not self._ignore_spec_has_negations:
+            self._ignored_dir_cache[dir_path] = is_ignored
+        return is_ignored
 
 
     @asynccontextmanager
@@ -409,8 +710,15 @@ class LanguageServer:
         ```
         """
         self.server_started = True
+        self._loop = asyncio.get_running_loop()
         yield self
         self.server_started = False
+        self._close_cache_connection()
+        # the server has been shut down, so the files need not be closed explicitly
+        for uri in self._lingering_file_buffer_uris:
+            del self.open_file_buffers[uri]
+        self._lingering_file_buffer_uris.clear()
+        self._loop = None
 
     # TODO: Add support for more LSP features
 
@@ -428,21 +736,74 @@ class LanguageServer:
             )
             raise MultilspyException("Language Server not started")
 
-        absolute_file_path = str(PurePath(self.repository_root_path, relative_file_path))
-        uri = pathlib.Path(absolute_file_path).as_uri()
+        file_buffer = self._acquire_file_buffer(relative_file_path)
+        yield file_buffer
+        self._release_file_buffer(file_buffer.uri)
+
+    @asynccontextmanager
+    async def _open_files(self, relative_file_paths: List[str]) -> AsyncIterator[List[LSPFileBuffer]]:
+        """
+        Like `open_file`, but opens several files at once: the files which are not open yet are read concurrently
+        and the didOpen notifications are sent together.
+
+        :param relative_file_paths: The relative paths of the files to open.
+        :return: the file buffers, in the order of the given paths
+        """
+        if not self.server_started:
+            self.logger.log(
+                "_open_files called before Language Server started",
+                logging.ERROR,
+            )
+            raise MultilspyException("Language Server not started")
+
+        absolute_file_paths = [_absolute_file_path(self.repository_root_path, p) for p in relative_file_paths]
+        paths_to_read = list(dict.fromkeys(p for p in absolute_file_paths if _file_uri(p) not in self.open_file_buffers))
+        read_results = await asyncio.gather(*(asyncio.to_thread(self._read_file, p) for p in paths_to_read))
+        read_results_by_path = dict(zip(paths_to_read, read_results))
+
+        file_buffers = [
+            self._acquire_file_buffer(relative_file_path, read_result=read_results_by_path.pop(absolute_file_path, None))
+            for relative_file_path, absolute_file_path in zip(relative_file_paths, absolute_file_paths)
+        ]
+        try:
+            yield file_buffers
+        finally:
+            for file_buffer in file_buffers:
+                self._release_file_buffer(file_buffer.uri)
+
+    def _read_file(self, absolute_file_path: str) -> Tuple[str, Optional[Tuple[int, int]]]:
+        """
+        :return: a tuple (contents, stat_signature) for the given file
+        """
+        stat_signature = self._get_stat_signature(absolute_file_path)
+        return FileUtils.read_file(self.logger, absolute_file_path), stat_signature
+
+    def _acquire_file_buffer(self, relative_file_path: str, read_result: Optional[Tuple[str, Optional[Tuple[int, int]]]] = None) -> LSPFileBuffer:
+        """
+        Opens the file in the Language Server if it is not open yet and increments the reference count of its buffer.
+
+        :param relative_file_path: The relative path of the file to open.
+        :param read_result: the result of `_read_file` for the file, if it was already read
+        """
+        absolute_file_path = _absolute_file_path(self.repository_root_path, relative_file_path)
+        uri = _file_uri(absolute_file_path)
+
+        if uri in self.open_file_buffers and self.open_file_buffers[uri].ref_count == 0:
+            # the buffer was kept open after its last use; it can be reused only if the file did not change on disk
+            del self._lingering_file_buffer_uris[uri]
+            file_buffer = self.open_file_buffers[uri]
+            if file_buffer.version != 0 or file_buffer.stat_signature != self._get_stat_signature(absolute_file_path):
+                self._close_file_buffer(uri)
 
         if uri in self.open_file_buffers:
             assert self.open_file_buffers[uri].uri == uri
-            assert self.open_file_buffers[uri].ref_count >= 1
 
             self.open_file_buffers[uri].ref_count += 1
-            yield self.open_file_buffers[uri]
-            self.open_file_buffers[uri].ref_count -= 1
         else:
-            contents = FileUtils.read_file(self.logger, absolute_file_path)
+            contents, stat_signature = read_result if read_result is not None else self._read_file(absolute_file_path)
 
             version = 0
-            self.open_file_buffers[uri] = LSPFileBuffer(uri, contents, version, self.language_id, 1)
+            self.open_file_buffers[uri] = LSPFileBuffer(uri, contents, version, self.language_id, 1, stat_signature=stat_signature)
 
             self.server.notify.did_open_text_document(
                 {
@@ -454,18 +815,74 @@ class LanguageServer:
                     }
                 }
             )
-            yield self.open_file_buffers[uri]
-            self.open_file_buffers[uri].ref_count -= 1
+        return self.open_file_buffers[uri]
+
+    def _release_file_buffer(self, uri: str) -> None:
+        """
+        Decrements the reference count of the given buffer and closes the file if it is no longer referenced.
+        """
+        self.open_file_buffers[uri].ref_count -= 1
 
         if self.open_file_buffers[uri].ref_count == 0:
-            self.server.notify.did_close_text_document(
-                {
-                    LSPConstants.TEXT_DOCUMENT: {
-                        LSPConstants.URI: uri,
-                    }
+            if self.open_file_buffers[uri].version == 0 and self.max_lingering_file_buffers > 0:
+                # keep the unmodified buffer open, such that repeated requests for the same file
+                # do not each require a didOpen/didClose notification pair
+                self._lingering_file_buffer_uris[uri] = None
+                while len(self._lingering_file_buffer_uris) > self.max_lingering_file_buffers:
+                    evicted_uri, _ = self._lingering_file_buffer_uris.popitem(last=False)
+                    self._close_file_buffer(evicted_uri)
+            else:
+                self._close_file_buffer(uri)
+
+    def _get_current_file_buffer(self, absolute_file_path: str) -> Optional[LSPFileBuffer]:
+        """
+        Thread-safe function returning the open buffer of the given file, if its contents are current.
+        A lingering buffer (see max_lingering_file_buffers) is not in use, so the file may have changed on disk since it
+        was opened; it is returned only if the file's stat signature is unchanged, and it is closed otherwise.
+        """
+        file_buffer = self.open_file_buffers.get(_file_uri(absolute_file_path))
+        if file_buffer is None or file_buffer.ref_count > 0:
+            return file_buffer
+        if file_buffer.stat_signature is not None and file_buffer.stat_signature == self._get_stat_signature(absolute_file_path):
+            return file_buffer
+        # the buffers are managed on the event loop, so the buffer is closed there if this is called from another thread
+        try:
+            is_loop_thread = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            is_loop_thread = False
+        if is_loop_thread:
+            self._close_lingering_file_buffer_if_stale(absolute_file_path)
+        elif self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._close_lingering_file_buffer_if_stale, absolute_file_path)
+        return None
+
+    def _close_lingering_file_buffer_if_stale(self, absolute_file_path: str) -> None:
+        """
+        Closes the lingering buffer of the given file (if there still is one) if the file changed on disk since it was opened.
+        """
+        uri = _file_uri(absolute_file_path)
+        if uri in self._lingering_file_buffer_uris \
+                and self.open_file_buffers[uri].stat_signature != self._get_stat_signature(absolute_file_path):
+            del self._lingering_file_buffer_uris[uri]
+            self._close_file_buffer(uri)
+
+    @staticmethod
+    def _get_stat_signature(absolute_file_path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(absolute_file_path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _close_file_buffer(self, uri: str) -> None:
+        self.server.notify.did_close_text_document(
+            {
+                LSPConstants.TEXT_DOCUMENT: {
+                    LSPConstants.URI: uri,
                 }
-            )
-            del self.open_file_buffers[uri]
+            }
+        )
+        del self.open_file_buffers[uri]
 
     def insert_text_at_position(
         self, relative_file_path: str, line: int, column: int, text_to_be_inserted: str
@@ -486,8 +903,8 @@ class LanguageServer:
             )
             raise MultilspyException("Language Server not started")
 
-        absolute_file_path = str(PurePath(self.repository_root_path, relative_file_path))
-        uri = pathlib.Path(absolute_file_path).as_uri()
+        absolute_file_path = _absolute_file_path(self.repository_root_path, relative_file_path)
+        uri = _file_uri(absolute_file_path)
 
         # Ensure the file is open
         assert uri in self.open_file_buffers
@@ -495,9 +912,11 @@ class LanguageServer:
         file_buffer = self.open_file_buffers[uri]
         file_buffer.version += 1
         change_index = TextUtils.get_index_from_line_col(file_buffer.contents, line, column)
-        file_buffer.contents = (
-            file_buffer.contents[:change_index] + text_to_be_inserted + file_buffer.contents[change_index:]
+        file_buffer.contents = "".join(
+            (file_buffer.contents[:change_index], text_to_be_inserted, file_buffer.contents[change_index:])
         )
+        file_buffer._content_hash = None
+        file_buffer._lines = None
         self.server.notify.did_change_text_document(
             {
                 LSPConstants.TEXT_DOCUMENT: {
@@ -534,8 +953,8 @@ class LanguageServer:
             )
             raise MultilspyException("Language Server not started")
 
-        absolute_file_path = str(PurePath(self.repository_root_path, relative_file_path))
-        uri = pathlib.Path(absolute_file_path).as_uri()
+        absolute_file_path = _absolute_file_path(self.repository_root_path, relative_file_path)
+        uri = _file_uri(absolute_file_path)
 
         # Ensure the file is open
         assert uri in self.open_file_buffers
@@ -546,6 +965,8 @@ class LanguageServer:
         del_end_idx = TextUtils.get_index_from_line_col(file_buffer.contents, end["line"], end["character"])
         deleted_text = file_buffer.contents[del_start_idx:del_end_idx]
         file_buffer.contents = file_buffer.contents[:del_start_idx] + file_buffer.contents[del_end_idx:]
+        file_buffer._content_hash = None
+        file_buffer._lines = None
         self.server.notify.did_change_text_document(
             {
                 LSPConstants.TEXT_DOCUMENT: {
@@ -578,58 +999,31 @@ class LanguageServer:
             )
             raise MultilspyException("Language Server not started")
 
-        with self.open_file(relative_file_path):
+        with self.open_file(relative_file_path) as file_data:
             # sending request to the language server and waiting for response
-            response = await self.server.send.definition(
-                {
-                    LSPConstants.TEXT_DOCUMENT: {
-                        LSPConstants.URI: pathlib.Path(
-                            str(PurePath(self.repository_root_path, relative_file_path))
-                        ).as_uri()
-                    },
-                    LSPConstants.POSITION: {
-                        LSPConstants.LINE: line,
-                        LSPConstants.CHARACTER: column,
-                    },
-                }
+            response = await self._send_coalesced_request(
+                ("definition", file_data.uri, file_data.version, line, column),
+                lambda: self.server.send.definition(
+                    {
+                        LSPConstants.TEXT_DOCUMENT: {
+                            LSPConstants.URI: file_data.uri
+                        },
+                        LSPConstants.POSITION: {
+                            LSPConstants.LINE: line,
+                            LSPConstants.CHARACTER: column,
+                        },
+                    }
+                )
             )
 
         ret: List[multilspy_types.Location] = []
         
         if isinstance(response, list):
             # response is either of type Location[] or LocationLink[]
-            for item in response:
-                assert isinstance(item, dict)
-                if LSPConstants.URI in item and LSPConstants.RANGE in item:
-                    # Standard Location object
-                    enriched_location = self._path_mapper.enrich_location(item)
-                    ret.append(multilspy_types.Location(**enriched_location))
-                elif (
-                    LSPConstants.ORIGIN_SELECTION_RANGE in item
-                    and LSPConstants.TARGET_URI in item
-                    and LSPConstants.TARGET_RANGE in item
-                    and LSPConstants.TARGET_SELECTION_RANGE in item
-                ):
-                    # LocationLink object
-                    new_item = {
-                        "uri": item[LSPConstants.TARGET_URI],
-                        "range": item[LSPConstants.TARGET_SELECTION_RANGE]
-                    }
-                    enriched_location = self._path_mapper.enrich_location(new_item)
-                    ret.append(multilspy_types.Location(**enriched_location))
-                else:
-                    # Skip items with unexpected format
-                    self.logger.log(f"Skipping item with unexpected format: {item}", logging.WARNING)
-                    continue
-                    
+            ret = self._parse_locations(response, skip_ignored=False)
         elif isinstance(response, dict):
             # response is of type Location
-            assert LSPConstants.URI in response
-            assert LSPConstants.RANGE in response
-            
-            enriched_location = self._path_mapper.enrich_location(response)
-            ret.append(multilspy_types.Location(**enriched_location))
-            
+            ret = self._parse_locations([response], skip_ignored=False)
         elif response is None:
             # Some language servers return None when they cannot find a definition
             # This is expected for certain symbol types like generics or types with incomplete information
@@ -642,11 +1036,96 @@ class LanguageServer:
             
         return ret
 
+    def _parse_locations(self, response_items: List[Any], skip_ignored: bool) -> List[multilspy_types.Location]:
+        """
+        Converts the items of a definition or references response, which are Location or LocationLink objects,
+        to locations enriched with the absolute and relative paths. Items with an unexpected format are skipped.
+
+        :param response_items: the items of the response
+        :param skip_ignored: whether to skip locations in files that should be ignored (see `is_ignored_path`)
+        """
+        ret: List[multilspy_types.Location] = []
+        # Locations are typically concentrated in few files, so the paths and the ignore decision
+        # are determined once per distinct URI: uri -> (absolute_path, relative_path, is_ignored)
+        uri_to_path_info: Dict[str, Tuple[str, Optional[str], bool]] = {}
+        for item in response_items:
+            if type(item) is not dict:
+                self.logger.log(f"Skipping item with unexpected format: {item}", logging.WARNING)
+                continue
+            uri = item.get(LSPConstants.URI)
+            if uri is not None:
+                # Location object
+                if LSPConstants.RANGE not in item:
+                    self.logger.log(f"Skipping item with unexpected format: {item}", logging.WARNING)
+                    continue
+                location = item
+            else:
+                # LocationLink object
+                uri = item.get(LSPConstants.TARGET_URI)
+                target_selection_range = item.get(LSPConstants.TARGET_SELECTION_RANGE)
+                if uri is None or target_selection_range is None:
+                    self.logger.log(f"Skipping item with unexpected format: {item}", logging.WARNING)
+                    continue
+                location = {"uri": uri, "range": target_selection_range}
+
+            path_info = uri_to_path_info.get(uri)
+            if path_info is None:
+                absolute_path = self._path_mapper.uri_to_absolute_path(uri)
+                relative_path = self._path_mapper.uri_to_relative_path(uri)
+                is_ignored = skip_ignored and bool(relative_path) and self.is_ignored_path(relative_path)
+                if is_ignored:
+                    self.logger.log(f"Ignoring locations in {relative_path} since it should be ignored", logging.DEBUG)
+                path_info = uri_to_path_info[uri] = (absolute_path, relative_path, is_ignored)
+            absolute_path, relative_path, is_ignored = path_info
+            if is_ignored:
+                continue
+
+            location.setdefault("absolutePath", absolute_path)
+            if relative_path:
+                location.setdefault("relativePath", relative_path)
+            ret.append(multilspy_types.Location(**location))
+        return ret
+
+    async def request_definition_many(self, positions: List[Tuple[str, int, int]]) -> List[List[multilspy_types.Location]]:
+        """
+        Like `request_definition`, but for several positions at once: the requests are sent concurrently
+        instead of awaiting the response of each request before sending the next one.
+
+        :param positions: the positions as tuples (relative_file_path, line, column)
+        :return: the definitions for each of the positions (see `request_definition`), in the order of the positions
+        """
+        return list(await asyncio.gather(*(self.request_definition(p, line, column) for p, line, column in positions)))
+
+    async def _send_coalesced_request(self, key: Hashable, send_request: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Sends a request and awaits its response, unless an identical request is already in flight, in which case the response
+        of the pending request is awaited instead (e.g. when several callers look up the same position concurrently).
+        Responses are not retained beyond the pending request, so they cannot become stale.
+
+        :param key: the key identifying the request, which must capture everything the response depends on
+            (including the version of the file's contents)
+        :param send_request: the function sending the request
+        :return: the response (a copy of it for each caller, if several callers awaited the same request)
+        """
+        in_flight_request = self._in_flight_requests.get(key)
+        if in_flight_request is None:
+            in_flight_request = _InFlightRequest(asyncio.ensure_future(send_request()))
+            self._in_flight_requests[key] = in_flight_request
+            in_flight_request.future.add_done_callback(lambda _: self._in_flight_requests.pop(key, None))
+        else:
+            in_flight_request.num_callers += 1
+        # shielded, such that a cancelled caller does not cancel the request for the other callers
+        response = await asyncio.shield(in_flight_request.future)
+        # the callers may modify the response, so a shared response is copied (no caller joins once the response is available)
+        if in_flight_request.num_callers > 1:
+            response = copy.deepcopy(response)
+        return response
+
     # Some LS cause problems with this, so the call is isolated from the rest to allow overriding in subclasses
     async def _send_references_request(self, relative_file_path: str, line: int, column: int):
         return await self.server.send.references(
             {
-                "textDocument": {"uri": PathUtils.path_to_uri(os.path.join(self.repository_root_path, relative_file_path))},
+                "textDocument": {"uri": _file_uri(_absolute_file_path(self.repository_root_path, relative_file_path))},
                 "position": {"line": line, "character": column},
                 "context": {"includeDeclaration": False},
             }
@@ -674,9 +1153,12 @@ class LanguageServer:
             )
             raise MultilspyException("Language Server not started")
 
-        with self.open_file(relative_file_path):
+        with self.open_file(relative_file_path) as file_data:
             try:
-                response = await self._send_references_request(relative_file_path, line=line, column=column)
+                response = await self._send_coalesced_request(
+                    ("references", file_data.uri, file_data.version, line, column),
+                    lambda: self._send_references_request(relative_file_path, line=line, column=column)
+                )
             except Exception as e:
                 # Catch LSP internal error (-32603) and raise a more informative exception
                 if isinstance(e, Error) and getattr(e, 'code', None) == -32603:
@@ -695,23 +1177,17 @@ class LanguageServer:
             return ret
             
         assert isinstance(response, list), f"Unexpected response from Language Server: {response}"
-        
-        for item in response:
-            assert isinstance(item, dict), f"Unexpected response from Language Server (expected dict, got {type(item)}): {item}"
-            assert LSPConstants.URI in item
-            assert LSPConstants.RANGE in item
-
-            # Use the UriPathMapper to get the relative path
-            enriched_location = self._path_mapper.enrich_location(item)
-            
-            # Check if the path should be ignored
-            if "relativePath" in enriched_location and self.is_ignored_path(enriched_location["relativePath"]):
-                self.logger.log(f"Ignoring reference in {enriched_location['relativePath']} since it should be ignored", logging.DEBUG)
-                continue
+        return self._parse_locations(response, skip_ignored=True)
 
-            ret.append(multilspy_types.Location(**enriched_location))
+    async def request_references_many(self, positions: List[Tuple[str, int, int]]) -> List[List[multilspy_types.Location]]:
+        """
+        Like `request_references`, but for several positions at once: the requests are sent concurrently
+        instead of awaiting the response of each request before sending the next one.
 
-        return ret
+        :param positions: the positions as tuples (relative_file_path, line, column)
+        :return: the references for each of the positions (see `request_references`), in the order of the positions
+        """
+        return list(await asyncio.gather(*(self.request_references(p, line, column) for p, line, column in positions)))
 
     async def request_references_with_content(
         self, relative_file_path: str, line: int, column: int, context_lines_before: int = 0, context_lines_after: int = 0
@@ -728,14 +1204,23 @@ class LanguageServer:
         :return: A list of MatchedConsecutiveLines objects, one for each reference.
         """
         references = await self.request_references(relative_file_path, line, column)
-        return [self.retrieve_content_around_line(ref["relativePath"], ref["range"]["start"]["line"], context_lines_before, context_lines_after) for ref in references]
+        # the lines are read without opening the files in the Language Server, and each file is read and split into lines
+        # only once, even if it contains several references
+        referencing_file_paths = list(dict.fromkeys(ref["relativePath"] for ref in references))
+        lines_by_path = await asyncio.to_thread(lambda: {path: self._read_file_lines(path) for path in referencing_file_paths})
+        return [
+            self._get_content_around_line(
+                lines_by_path[ref["relativePath"]], ref["relativePath"], ref["range"]["start"]["line"], context_lines_before, context_lines_after
+            )
+            for ref in references
+        ]
 
     def retrieve_full_file_content(self, relative_file_path: str) -> str:
         """
         Retrieve the full content of the given file.
         """
-        with self.open_file(relative_file_path) as file_data:
-            return file_data.contents
+        # the contents are read without opening the file in the Language Server
+        return self._read_file_content(relative_file_path)
 
     def retrieve_content_around_line(self, relative_file_path: str, line: int, context_lines_before: int = 0, context_lines_after: int = 0) -> MatchedConsecutiveLines:
         """
@@ -748,10 +1233,15 @@ class LanguageServer:
 
         :return MatchedConsecutiveLines: A container with the desired lines.
         """
-        with self.open_file(relative_file_path) as file_data:
-            file_contents = file_data.contents
+        return self._get_content_around_line(self._read_file_lines(relative_file_path), relative_file_path, line, context_lines_before,
+            context_lines_after)
 
-        line_contents = file_contents.split("\n")
+    @staticmethod
+    def _get_content_around_line(line_contents: List[str], relative_file_path: str, line: int, context_lines_before: int,
+            context_lines_after: int) -> MatchedConsecutiveLines:
+        """
+        :param line_contents: the lines of the file (at least up to line + context_lines_after, if the file has these lines)
+        """
         start_lineno = max(0, line - context_lines_before)
         end_lineno = min(len(line_contents) - 1, line + context_lines_after)
         # instantiate TextLines with the write LineType
@@ -783,7 +1273,7 @@ class LanguageServer:
         """
         with self.open_file(relative_file_path):
             open_file_buffer = self.open_file_buffers[
-                pathlib.Path(os.path.join(self.repository_root_path, relative_file_path)).as_uri()
+                _file_uri(_absolute_file_path(self.repository_root_path, relative_file_path))
             ]
             completion_params: LSPTypes.CompletionParams = {
                 "position": {"line": line, "character": column},
@@ -793,7 +1283,13 @@ class LanguageServer:
             response: Union[List[LSPTypes.CompletionItem], LSPTypes.CompletionList, None] = None
 
             num_retries = 0
+            # incomplete results are requested again, unless the number of items stopped changing
+            num_items_history: List[int] = []
             while response is None or (response["isIncomplete"] and num_retries < 30):
+                if response is not None:
+                    num_items_history.append(len(response.get("items", [])))
+                    if len(num_items_history) >= 3 and len(set(num_items_history[-3:])) == 1:
+                        break
                 await self.completions_available.wait()
                 response: Union[
                     List[LSPTypes.CompletionItem], LSPTypes.CompletionList, None
@@ -854,13 +1350,12 @@ class LanguageServer:
                 else:
                     assert False
 
-                completion_item = multilspy_types.CompletionItem(**completion_item)
-                completions_list.append(completion_item)
+                # the dict is already in the form of a CompletionItem, so it is not copied
+                completions_list.append(cast(multilspy_types.CompletionItem, completion_item))
 
-            return [
-                json.loads(json_repr)
-                for json_repr in set([json.dumps(item, sort_keys=True) for item in completions_list])
-            ]
+            # remove duplicates; the values of completion items are all hashable (str and int)
+            unique_completions = {frozenset(item.items()): item for item in completions_list}
+            return list(unique_completions.values())
 
     async def request_document_symbols(self, relative_file_path: str, include_body: bool = False) -> Tuple[List[multilspy_types.UnifiedSymbolInformation], List[multilspy_types.UnifiedSymbolInformation]]:
         """
@@ -876,12 +1371,21 @@ class LanguageServer:
         self.logger.log(f"Requesting document symbols for {relative_file_path} for the first time", logging.DEBUG)
         # TODO: it's kinda dumb to not use the cache if include_body is False after include_body was True once
         #   Should be fixed in the future, it's a small performance optimization
-        cache_key = f"{relative_file_path}-{include_body}"
+        cache_key = self._get_document_symbols_cache_key(relative_file_path, include_body)
+
+        # the entry is looked up only once, also if the file needs to be opened for validating it
+        file_hash_and_result = await self._cache_get(cache_key)
+        if file_hash_and_result is not None and self._is_cached_entry_current_for_unopened_file(relative_file_path, cache_key):
+            self.logger.log(f"Returning cached document symbols for {relative_file_path}", logging.DEBUG)
+            return file_hash_and_result[1]
+
         with self.open_file(relative_file_path) as file_data:
-            file_hash_and_result = self._document_symbols_cache.get(cache_key)
             if file_hash_and_result is not None:
                 file_hash, result = file_hash_and_result
-                if file_hash == file_data.content_hash:
+                # if the file did not change on disk since the entry was computed, it is valid without hashing the contents
+                is_unchanged_on_disk = file_data.version == 0 and file_data.stat_signature is not None \
+                    and self._cache_stat_signatures.get(cache_key) == file_data.stat_signature
+                if is_unchanged_on_disk or file_hash == file_data.content_hash:
                     self.logger.log(f"Returning cached document symbols for {relative_file_path}", logging.DEBUG)
                     return result
                 else:
@@ -891,7 +1395,7 @@ class LanguageServer:
             response = await self.server.send.document_symbol(
                 {
                     "textDocument": {
-                        "uri": pathlib.Path(os.path.join(self.repository_root_path, relative_file_path)).as_uri()
+                        "uri": _file_uri(_absolute_file_path(self.repository_root_path, relative_file_path))
                     }
                 }
             )
@@ -899,6 +1403,7 @@ class LanguageServer:
         # Handle case where response is None
         if response is None:
             self.logger.log(f"No response from Language Server for document symbols request", logging.WARNING)
+            # the missing response is not cached, since it may be transient (e.g. the server not being ready yet)
             return ([], [])
             
         assert isinstance(response, list), f"Unexpected response from Language Server: {response}"
@@ -919,9 +1424,9 @@ class LanguageServer:
             # Ensure children attribute is present
             enriched_item[LSPConstants.CHILDREN] = enriched_item.get(LSPConstants.CHILDREN, [])
             
-            # Add body if requested
+            # Add body if requested (from the lines of the file read above, instead of reading the file again for each symbol)
             if include_body and "location" in enriched_item and "relativePath" in enriched_item["location"]:
-                enriched_item['body'] = self.retrieve_symbol_body(enriched_item)
+                enriched_item['body'] = enriched_item.get("body") or self._get_symbol_body(enriched_item, file_data.lines)
                 
             enriched_response.append(enriched_item)
             
@@ -936,26 +1441,41 @@ class LanguageServer:
             # Add to flat list
             if LSPConstants.CHILDREN in item and item[LSPConstants.CHILDREN]:
                 # Build flat list by traversing the tree
-                def visit_tree_nodes_and_build_flat_list(node: GenericDocumentSymbol) -> List[multilspy_types.UnifiedSymbolInformation]:
-                    node = cast(multilspy_types.UnifiedSymbolInformation, node)
-                    result_list: List[multilspy_types.UnifiedSymbolInformation] = [node]
-                    
-                    if LSPConstants.CHILDREN in node:
-                        for child in node[LSPConstants.CHILDREN]:
-                            result_list.extend(visit_tree_nodes_and_build_flat_list(child))
-                            
-                    return result_list
-                
-                flat_all_symbol_list.extend(visit_tree_nodes_and_build_flat_list(item))
+                _flatten_symbol_tree(item, flat_all_symbol_list)
             else:
                 flat_all_symbol_list.append(multilspy_types.UnifiedSymbolInformation(**item))
 
         result = flat_all_symbol_list, root_nodes
         self.logger.log(f"Caching document symbols for {relative_file_path}", logging.DEBUG)
-        self._document_symbols_cache[cache_key] = (file_data.content_hash, result)
-        self._cache_has_changed = True
+        stat_signature = file_data.stat_signature if file_data.version == 0 else None
+        self._cache_put(cache_key, file_data.content_hash, stat_signature, result)
         return result
     
+    async def _get_cached_document_symbols_of_unopened_file(self, relative_file_path: str, include_body: bool) \
+            -> Optional[Tuple[List[multilspy_types.UnifiedSymbolInformation], List[multilspy_types.UnifiedSymbolInformation]]]:
+        """
+        Returns the cached result of `request_document_symbols` if the file is not open and unchanged on disk since the result
+        was computed. Such a result can be returned without opening the file, saving the didOpen/didClose notifications
+        (and the analysis they may trigger in the server).
+
+        :return: the cached result or None if there is no such result
+        """
+        cache_key = self._get_document_symbols_cache_key(relative_file_path, include_body)
+        file_hash_and_result = await self._cache_get(cache_key)
+        if file_hash_and_result is None or not self._is_cached_entry_current_for_unopened_file(relative_file_path, cache_key):
+            return None
+        return file_hash_and_result[1]
+
+    def _is_cached_entry_current_for_unopened_file(self, relative_file_path: str, cache_key: str) -> bool:
+        """
+        :return: whether the given file is not open and unchanged on disk since the cached entry with the given key was computed
+        """
+        absolute_file_path = _absolute_file_path(self.repository_root_path, relative_file_path)
+        if _file_uri(absolute_file_path) in self.open_file_buffers:
+            return False
+        stat_signature = self._get_stat_signature(absolute_file_path)
+        return stat_signature is not None and self._cache_stat_signatures.get(cache_key) == stat_signature
+
     async def request_full_symbol_tree(self, within_relative_path: str | None = None, include_body: bool = False) -> List[multilspy_types.UnifiedSymbolInformation]:
         """
         Will go through all files in the project and build a tree of symbols. Note: this may be slow the first time it is called.
@@ -986,18 +1506,32 @@ class LanguageServer:
                     _, root_nodes = await self.request_document_symbols(within_relative_path, include_body=include_body)
                     return root_nodes
 
+        # Bounds the number of concurrent document symbol requests (across all directories)
+        request_semaphore = asyncio.Semaphore(self.max_concurrent_symbol_requests)
+
         # Helper function to recursively process directories
-        async def process_directory(dir_path: str) -> List[multilspy_types.UnifiedSymbolInformation]:
-            abs_dir_path = self.repository_root_path if dir_path == "." else os.path.join(self.repository_root_path, dir_path)
-            abs_dir_path = os.path.realpath(abs_dir_path)
+        async def process_directory(dir_path: str, is_resolved: bool = False) -> List[multilspy_types.UnifiedSymbolInformation]:
+            """
+            :param dir_path: the path of the directory, relative to the repository root or absolute
+            :param is_resolved: whether dir_path is a relative path without symlinks (as determined for subdirectories),
+                such that resolving it (which requires a system call per path component) can be skipped
+            """
+            if is_resolved:
+                abs_dir_path = os.path.join(self.repository_root_path, dir_path)
+                rel_dir_path = dir_path
+            else:
+                abs_dir_path = self.repository_root_path if dir_path == "." else os.path.join(self.repository_root_path, dir_path)
+                abs_dir_path = os.path.realpath(abs_dir_path)
+                rel_dir_path = str(Path(abs_dir_path).relative_to(self.repository_root_path))
 
-            if self.is_ignored_path(str(Path(abs_dir_path).relative_to(self.repository_root_path))):
+            if self.is_ignored_path(rel_dir_path):
                 self.logger.log(f"Skipping directory: {dir_path}\n(because it should be ignored)", logging.DEBUG)
                 return []
 
             result = []
             try:
-                items = os.listdir(abs_dir_path)
+                with os.scandir(abs_dir_path) as it:
+                    dir_entries = list(it)
             except OSError:
                 return []
 
@@ -1006,66 +1540,102 @@ class LanguageServer:
                 name=os.path.basename(abs_dir_path),
                 kind=multilspy_types.SymbolKind.Package,
                 location=multilspy_types.Location(
-                    uri=str(pathlib.Path(abs_dir_path).as_uri()),
+                    uri=_file_uri(abs_dir_path),
                     range={"start": {"line": 0, "character": 0}, "end": {"line": 0, "character": 0}},
                     absolutePath=str(abs_dir_path),
-                    relativePath=str(Path(abs_dir_path).resolve().relative_to(self.repository_root_path)),
+                    relativePath=rel_dir_path,
                 ),
                 children=[]
             )
             result.append(package_symbol)
 
-            for item in items:
-                item_path = os.path.join(abs_dir_path, item)
-                abs_item_path = os.path.join(self.repository_root_path, item_path)
-                rel_item_path = str(Path(abs_item_path).resolve().relative_to(self.repository_root_path))
-                if self.is_ignored_path(rel_item_path):
+            # tuples (item, absolute path, relative path of the resolved item) of the entries which are not ignored,
+            # split into files and directories
+            relevant_items: List[Tuple[str, str, str]] = []
+            file_items: List[Tuple[str, str, str]] = []
+            dir_items: List[Tuple[str, str, str]] = []
+            for dir_entry in dir_entries:
+                item = dir_entry.name
+                abs_item_path = dir_entry.path
+                # since abs_dir_path is resolved, the relative path of an item follows directly unless it is a symlink
+                if dir_entry.is_symlink():
+                    rel_item_path = str(Path(abs_item_path).resolve().relative_to(self.repository_root_path))
+                else:
+                    rel_item_path = item if rel_dir_path == "." else os.path.join(rel_dir_path, item)
+                if self._is_ignored_dir_entry(rel_item_path, dir_entry):
                     self.logger.log(f"Skipping item: {rel_item_path}\n(because it should be ignored)", logging.DEBUG)
                     continue
-
-                if os.path.isdir(abs_item_path):
-                    child_symbols = await process_directory(item_path)
-                    package_symbol["children"].extend(child_symbols)
-
-                elif os.path.isfile(abs_item_path):
-                    _, root_nodes = await self.request_document_symbols(item_path, include_body=include_body)
-
-                    # TODO: Not sure if this is actually still needed given recent changes to relative path handling
-                    def fix_relative_path(nodes: List[multilspy_types.UnifiedSymbolInformation]):
-                        for node in nodes:
-                            # Check if location and relativePath exist before trying to access them
-                            if "location" in node and "relativePath" in node["location"]:
-                                path = Path(node["location"]["relativePath"])
-                                if path.is_absolute():
-                                    try:
-                                        path = path.relative_to(self.repository_root_path)
-                                        node["location"]["relativePath"] = str(path)
-                                    except Exception:
-                                        pass
-                            if "children" in node:
-                                fix_relative_path(node["children"])
-
-                    fix_relative_path(root_nodes)
-
-                    # Create file symbol
-                    file_rel_path = str(Path(abs_item_path).resolve().relative_to(self.repository_root_path))
-                    with self.open_file(file_rel_path) as file_data:
-                        fileRange = self._get_range_from_file_content(file_data.contents)
-                    file_symbol = multilspy_types.UnifiedSymbolInformation( # type: ignore
-                        name=os.path.splitext(item)[0],
-                        kind=multilspy_types.SymbolKind.File,
+                relevant_items.append((item, abs_item_path, rel_item_path))
+                # the type information is provided by scandir and (for non-symlinks) requires no further system calls
+                if dir_entry.is_file():
+                    file_items.append(relevant_items[-1])
+                elif dir_entry.is_dir():
+                    dir_items.append(relevant_items[-1])
+
+            async def process_file(item: str, abs_item_path: str, rel_item_path: str) -> multilspy_types.UnifiedSymbolInformation:
+                file_content: Optional[str] = None
+                async with request_semaphore:
+                    # The file is opened only while the semaphore is held (and only if its symbols are not cached), such that
+                    # the number of files open in the Language Server is bounded across all directories processed concurrently;
+                    # an opened file is read only once for retrieving both its symbols and its range
+                    is_cached = await self._get_cached_document_symbols_of_unopened_file(abs_item_path, include_body) is not None
+                    files_to_open = [] if is_cached else [abs_item_path]
+                    async with self._open_files(files_to_open) as file_buffers:
+                        _, root_nodes = await self.request_document_symbols(abs_item_path, include_body=include_body)
+                        if file_buffers:
+                            file_content = file_buffers[0].contents
+
+                # TODO: Not sure if this is actually still needed given recent changes to relative path handling
+                def fix_relative_path(nodes: List[multilspy_types.UnifiedSymbolInformation]):
+                    for node in nodes:
+                        # Check if location and relativePath exist before trying to access them
+                        if "location" in node and "relativePath" in node["location"]:
+                            path = Path(node["location"]["relativePath"])
+                            if path.is_absolute():
+                                try:
+                                    path = path.relative_to(self.repository_root_path)
+                                    node["location"]["relativePath"] = str(path)
+                                except Exception:
+                                    pass
+                        if "children" in node:
+                            fix_relative_path(node["children"])
+
+                fix_relative_path(root_nodes)
+
+                # Create file symbol
+                if file_content is None:
+                    file_content = await asyncio.to_thread(self._read_file_content, rel_item_path)
+                fileRange = self._get_range_from_file_content(file_content)
+                file_symbol = multilspy_types.UnifiedSymbolInformation( # type: ignore
+                    name=os.path.splitext(item)[0],
+                    kind=multilspy_types.SymbolKind.File,
+                    range=fileRange,
+                    selectionRange=fileRange,
+                    location=multilspy_types.Location(
+                        uri=_file_uri(abs_item_path),
                         range=fileRange,
-                        selectionRange=fileRange,
-                        location=multilspy_types.Location(
-                            uri=str(pathlib.Path(abs_item_path).as_uri()),
-                            range=fileRange,
-                            absolutePath=str(abs_item_path),
-                            relativePath=str(Path(abs_item_path).resolve().relative_to(self.repository_root_path)),
-                        ),
-                        children=root_nodes
-                    )
-
-                    package_symbol["children"].append(file_symbol)
+                        absolutePath=str(abs_item_path),
+                        relativePath=rel_item_path,
+                    ),
+                    children=root_nodes
+                )
+                return file_symbol
+
+            # The files' symbols are requested concurrently (bounded by the semaphore), as are the subdirectories processed
+            file_symbols = dict(zip(
+                (item for item, _, _ in file_items),
+                await asyncio.gather(*(process_file(*entry) for entry in file_items))
+            ))
+            dir_symbols = dict(zip(
+                (item for item, _, _ in dir_items),
+                await asyncio.gather(*(process_directory(rel_item_path, is_resolved=True) for _, _, rel_item_path in dir_items))
+            ))
+
+            for item, _, _ in relevant_items:
+                if item in file_symbols:
+                    package_symbol["children"].append(file_symbols[item])
+                elif item in dir_symbols:
+                    package_symbol["children"].extend(dir_symbols[item])
 
             return result
 
@@ -1078,9 +1648,10 @@ class LanguageServer:
         """
         Get the range for the given file.
         """
-        lines = file_content.split("\n")
-        end_line = len(lines)
-        end_column = len(lines[-1])
+        # the end line is the number of lines (as in len(file_content.split("\n"))), the end column the length of the last line;
+        # both are determined by scanning the contents without creating the lines
+        end_line = file_content.count("\n") + 1
+        end_column = len(file_content) - (file_content.rfind("\n") + 1)
         return multilspy_types.Range(
             start=multilspy_types.Position(line=0, character=0),
             end=multilspy_types.Position(line=end_line, character=end_column)
@@ -1093,31 +1664,44 @@ class LanguageServer:
         Maps relative paths of all contained files to info about top-level symbols in the file
         (name, kind, line, column).
         """
-        symbol_tree = await self.request_full_symbol_tree(relative_dir_path)
+        abs_dir_path = os.path.join(self.repository_root_path, relative_dir_path)
+        if not os.path.exists(abs_dir_path):
+            raise FileNotFoundError(f"File or directory not found: {abs_dir_path}")
         # Initialize result dictionary
         result: dict[str, list[tuple[str, multilspy_types.SymbolKind, int, int]]] = defaultdict(list)
+        if not os.path.isdir(abs_dir_path):
+            # there are no files within a file
+            return result
+        rel_dir_path = str(Path(os.path.realpath(abs_dir_path)).relative_to(self.repository_root_path))
+        if self.is_ignored_path(rel_dir_path):
+            return result
 
-        # Helper function to process a symbol and its children
-        def process_symbol(symbol: multilspy_types.UnifiedSymbolInformation):
-            if symbol["kind"] == multilspy_types.SymbolKind.File:
-                # For file symbols, process their children (top-level symbols)
-                for child in symbol["children"]:
-                    assert "location" in child
-                    assert "selectionRange" in child
-                    path = Path(child["location"]["absolutePath"]).resolve().relative_to(self.repository_root_path)
-                    result[str(path)].append((
-                        child["name"],
-                        child["kind"],
-                        child["selectionRange"]["start"]["line"],
-                        child["selectionRange"]["start"]["character"]
-                    ))
-            # For package/directory symbols, process their children
-            for child in symbol["children"]:
-                process_symbol(child)
-
-        # Process each root symbol
-        for root in symbol_tree:
-            process_symbol(root)
+        # Only the top-level symbols of the files are required, so instead of building the full symbol tree (which also reads
+        # every file for the range of its file symbol), the files are collected in the same order as in the tree and only
+        # their document symbols are requested (concurrently, and typically served from the cache without opening the file)
+        request_semaphore = asyncio.Semaphore(self.max_concurrent_symbol_requests)
+
+        async def request_root_symbols(abs_file_path: str) -> List[multilspy_types.UnifiedSymbolInformation]:
+            async with request_semaphore:
+                # the file is opened (and thereby read in a thread) only if its symbols are not cached;
+                # the absolute path is passed as in request_full_symbol_tree, such that the cache entries are shared
+                files_to_open = [] if await self._get_cached_document_symbols_of_unopened_file(abs_file_path, False) is not None \
+                    else [abs_file_path]
+                async with self._open_files(files_to_open):
+                    _, root_nodes = await self.request_document_symbols(abs_file_path)
+                return root_nodes
+
+        source_files = self._collect_source_files(rel_dir_path)
+        root_nodes_per_file = await asyncio.gather(*(request_root_symbols(abs_file_path) for _, abs_file_path in source_files))
+        for (rel_file_path, _), root_nodes in zip(source_files, root_nodes_per_file):
+            for root in root_nodes:
+                assert "selectionRange" in root
+                result[rel_file_path].append((
+                    root["name"],
+                    root["kind"],
+                    root["selectionRange"]["start"]["line"],
+                    root["selectionRange"]["start"]["character"]
+                ))
         return result
 
     async def request_document_overview(self, relative_file_path: str) -> list[tuple[str, multilspy_types.SymbolKind, int, int]]:
@@ -1169,17 +1753,20 @@ class LanguageServer:
 
         :return None
         """
-        with self.open_file(relative_file_path):
-            response = await self.server.send.hover(
-                {
-                    "textDocument": {
-                        "uri": pathlib.Path(os.path.join(self.repository_root_path, relative_file_path)).as_uri()
-                    },
-                    "position": {
-                        "line": line,
-                        "character": column,
-                    },
-                }
+        with self.open_file(relative_file_path) as file_data:
+            response = await self._send_coalesced_request(
+                ("hover", file_data.uri, file_data.version, line, column),
+                lambda: self.server.send.hover(
+                    {
+                        "textDocument": {
+                            "uri": file_data.uri
+                        },
+                        "position": {
+                            "line": line,
+                            "character": column,
+                        },
+                    }
+                )
             )
         
         if response is None:
@@ -1200,12 +1787,20 @@ class LanguageServer:
             return existing_body
 
         assert "location" in symbol
+        assert "relativePath" in symbol["location"]
+        return self._get_symbol_body(symbol, self._read_file_lines(symbol["location"]["relativePath"]))
+
+    @staticmethod
+    def _get_symbol_body(symbol: multilspy_types.UnifiedSymbolInformation | LSPTypes.DocumentSymbol | LSPTypes.SymbolInformation,
+            file_lines: List[str]) -> str:
+        """
+        :param symbol: the symbol, which must have a location
+        :param file_lines: the lines of the file containing the symbol
+        :return: the body of the symbol, as contained in the given lines
+        """
         symbol_start_line = symbol["location"]["range"]["start"]["line"]
         symbol_end_line = symbol["location"]["range"]["end"]["line"]
-        assert "relativePath" in symbol["location"]
-        symbol_file = self.retrieve_full_file_content(symbol["location"]["relativePath"])
-        symbol_lines = symbol_file.split("\n")
-        symbol_body = "\n".join(symbol_lines[symbol_start_line:symbol_end_line+1])
+        symbol_body = "\n".join(file_lines[symbol_start_line:symbol_end_line+1])
 
         # remove leading indentation
         symbol_start_column = symbol["location"]["range"]["start"]["character"]
@@ -1215,39 +1810,55 @@ class LanguageServer:
 
     async def request_parsed_files(self) -> list[str]:
         """
-        Retrieves relative paths of all files analyzed by the Language Server.
-
-        This is slow, as it finds all files by finding all symbols.
+        Retrieves relative paths of all files analyzed by the Language Server, i.e. all source files in the repository
+        which are not ignored.
 
-        This seems to be the only way, the LSP does not provide any endpoints for listing project files."""
+        The LSP does not provide any endpoints for listing project files, so the files are determined by traversing the repository
+        in the same way as request_full_symbol_tree does."""
         if not self.server_started:
             self.logger.log(
                 "request_parsed_files called before Language Server started",
                 logging.ERROR,
             )
             raise MultilspyException("Language Server not started")
-        # TODO: this worked in jedi, but pyright and basedpyright return nothing...
-        # I don't know why
-        # params = LSPTypes.WorkspaceSymbolParams(query="")  # Empty query returns all symbols
-        # symbols = await self.server.send.workspace_symbol(params) or []
-
-        # Thus, instead of calling all symbols, we hack this and use the symbol tree instead, which
-        # seems to work in all these language servers
-        # walk through all children recursively, find all symbols of type Module and collect their relative paths
-        roots = await self.request_full_symbol_tree()
-        paths = []
-        def collect_module_files(symbol):
-            if symbol["kind"] == multilspy_types.SymbolKind.File:
-                assert "location" in symbol
-                paths.append(symbol["location"]["relativePath"])
+        # Instead of requesting the symbol tree (which requires a document symbol request per file), the relevant files
+        # are collected by traversing the file system in the same way and applying the same ignore conditions as
+        # request_full_symbol_tree
+        if self.is_ignored_path("."):
+            return []
+        return [rel_item_path for rel_item_path, _ in self._collect_source_files(".")]
 
-            elif symbol["kind"] == multilspy_types.SymbolKind.Package:
-                for child in symbol["children"]:
-                    collect_module_files(child)
+    def _collect_source_files(self, rel_dir_path: str) -> List[Tuple[str, str]]:
+        """
+        Collects the source files in the given directory (recursively) by traversing the file system in the same order and
+        applying the same ignore conditions as request_full_symbol_tree.
 
-        for root in roots:
-            collect_module_files(root)
+        :param rel_dir_path: the relative path of the directory without symlinks (i.e. resolved), which must not be ignored
+        :return: the tuples (relative path of the resolved file, absolute path of the file)
+        """
+        paths = []
 
+        def collect(rel_dir_path: str) -> None:
+            # the relative paths of the directories are resolved (see below), so they need not be resolved again
+            abs_dir_path = self.repository_root_path if rel_dir_path == "." else os.path.join(self.repository_root_path, rel_dir_path)
+            try:
+                with os.scandir(abs_dir_path) as it:
+                    dir_entries = list(it)
+            except OSError:
+                return
+            for dir_entry in dir_entries:
+                if dir_entry.is_symlink():
+                    rel_item_path = str(Path(dir_entry.path).resolve().relative_to(self.repository_root_path))
+                else:
+                    rel_item_path = dir_entry.name if rel_dir_path == "." else os.path.join(rel_dir_path, dir_entry.name)
+                if self._is_ignored_dir_entry(rel_item_path, dir_entry):
+                    continue
+                if dir_entry.is_file():
+                    paths.append((rel_item_path, dir_entry.path))
+                elif dir_entry.is_dir():
+                    collect(rel_item_path)
+
+        collect(rel_dir_path)
         return paths
 
 
@@ -1273,16 +1884,71 @@ class LanguageServer:
             pattern = re.compile(pattern)
 
         relative_file_paths = await self.request_parsed_files()
-        return search_files(
+        # the files are read concurrently in a thread pool and the search is run outside of the event loop
+        return await asyncio.to_thread(
+            search_files,
             relative_file_paths,
             pattern,
-            file_reader=self.retrieve_full_file_content,
+            file_reader=self._read_file_content,
             context_lines_before=context_lines_before,
             context_lines_after=context_lines_after,
             paths_include_glob=paths_include_glob,
-            paths_exclude_glob=paths_exclude_glob
+            paths_exclude_glob=paths_exclude_glob,
+            max_workers=self.max_concurrent_file_reads,
         )
 
+    def _read_file_content(self, relative_file_path: str) -> str:
+        """
+        Thread-safe function for reading a file without opening it in the Language Server:
+        the contents of an open buffer are returned if present (see `_get_current_file_buffer`), otherwise the file is read
+        from disk, unless the contents of the file were read recently and the file did not change since (as determined by
+        its stat signature).
+        """
+        absolute_file_path = _absolute_file_path(self.repository_root_path, relative_file_path)
+        file_buffer = self._get_current_file_buffer(absolute_file_path)
+        if file_buffer is not None:
+            return file_buffer.contents
+        # the signature is determined before reading, such that a change during the read invalidates the entry
+        stat_signature = self._get_stat_signature(absolute_file_path)
+        if stat_signature is not None:
+            with self._file_contents_cache_lock:
+                cached_entry = self._file_contents_cache.get(absolute_file_path)
+                if cached_entry is not None and cached_entry[0] == stat_signature:
+                    self._file_contents_cache.move_to_end(absolute_file_path)
+                    return cached_entry[1]
+        contents = FileUtils.read_file(self.logger, absolute_file_path)
+        if stat_signature is not None:
+            with self._file_contents_cache_lock:
+                self._file_contents_cache[absolute_file_path] = (stat_signature, contents, None)
+                self._file_contents_cache.move_to_end(absolute_file_path)
+                while len(self._file_contents_cache) > self.max_cached_file_contents:
+                    self._file_contents_cache.popitem(last=False)
+        return contents
+
+    def _read_file_lines(self, relative_file_path: str) -> List[str]:
+        """
+        Like `_read_file_content`, but returns the lines of the contents (split at "\n"). The lines are kept alongside the
+        contents (of the open buffer or the contents cache), such that repeated accesses to the same file (e.g. the context
+        of several lines) do not split the file again. The list is shared and must not be modified.
+        """
+        absolute_file_path = _absolute_file_path(self.repository_root_path, relative_file_path)
+        file_buffer = self._get_current_file_buffer(absolute_file_path)
+        if file_buffer is not None:
+            return file_buffer.lines
+        contents = self._read_file_content(relative_file_path)
+        with self._file_contents_cache_lock:
+            cached_entry = self._file_contents_cache.get(absolute_file_path)
+        if cached_entry is None or cached_entry[1] is not contents:
+            # the contents were not cached (or were replaced concurrently)
+            return contents.split("\n")
+        if cached_entry[2] is not None:
+            return cached_entry[2]
+        lines = contents.split("\n")
+        with self._file_contents_cache_lock:
+            if self._file_contents_cache.get(absolute_file_path) is cached_entry:
+                self._file_contents_cache[absolute_file_path] = (cached_entry[0], contents, lines)
+        return lines
+
     async def request_referencing_symbols(
         self,
         relative_file_path: str,
@@ -1323,110 +1989,135 @@ class LanguageServer:
         if not references:
             return []
 
-        # For each reference, find the containing symbol
+        # The document symbols of the referencing files are requested concurrently (the subsequent lookups of the
+        # containing symbols are then served from the cache), such that there is one round trip per file instead of
+        # sequential round trips per reference.
+        # The results are also kept for the duration of this call, such that the heuristic below does not have
+        # to go through request_document_symbols again for every reference it handles
+        request_semaphore = asyncio.Semaphore(self.max_concurrent_symbol_requests)
+        document_symbols_by_path: Dict[str, Tuple[List[multilspy_types.UnifiedSymbolInformation], List[multilspy_types.UnifiedSymbolInformation]]] = {}
+
+        async def request_document_symbols_bounded(ref_path: str) -> None:
+            async with request_semaphore:
+                document_symbols_by_path[ref_path] = await self.request_document_symbols(ref_path)
+
+        referencing_file_paths = list(dict.fromkeys(ref["relativePath"] for ref in references))
+        await asyncio.gather(*(request_document_symbols_bounded(p) for p in referencing_file_paths))
+
+        # For each reference, find the containing symbol. The lines of the referencing files are read without opening the
+        # files in the Language Server (request_containing_symbol opens each file only while handling a single reference),
+        # such that the number of open files does not grow with the number of referencing files
+        lines_by_path = await asyncio.to_thread(lambda: {path: self._read_file_lines(path) for path in referencing_file_paths})
         result = []
+        variable_symbols_by_path: Dict[str, Dict[str, multilspy_types.UnifiedSymbolInformation]] = {}
         incoming_symbol = None
         for ref in references:
             ref_path = ref["relativePath"]
+            file_lines = lines_by_path[ref_path]
             ref_line = ref["range"]["start"]["line"]
             ref_col = ref["range"]["start"]["character"]
 
-            with self.open_file(ref_path) as file_data:
-                # Get the containing symbol for this reference
-                containing_symbol = await self.request_containing_symbol(
-                    ref_path, ref_line, ref_col, include_body=include_body
+            # Get the containing symbol for this reference
+            containing_symbol = await self.request_containing_symbol(
+                ref_path, ref_line, ref_col, include_body=include_body
+            )
+            if containing_symbol is None:
+                # TODO: HORRIBLE HACK! I don't know how to do it better for now...
+                # THIS IS BOUND TO BREAK IN MANY CASES! IT IS ALSO SPECIFIC TO PYTHON!
+                # Background:
+                # When a variable is used to change something, like
+                #
+                # instance = MyClass()
+                # instance.status = "new status"
+                #
+                # we can't find the containing symbol for the reference to `status`
+                # since there is no container on the line of the reference
+                # The hack is to try to find a variable symbol in the containing module
+                # by using the text of the reference to find the variable name (In a very heuristic way)
+                # and then look for a symbol with that name and kind Variable
+                ref_text = file_lines[ref_line]
+                if "." in ref_text:
+                    containing_symbol_name = ref_text.partition(".")[0]
+                    if ref_path not in variable_symbols_by_path:
+                        # index the variables of the file by name once (the first symbol with a given name wins)
+                        variable_symbols: Dict[str, multilspy_types.UnifiedSymbolInformation] = {}
+                        for symbol in document_symbols_by_path[ref_path][0]:
+                            if symbol["kind"] == multilspy_types.SymbolKind.Variable:
+                                variable_symbols.setdefault(symbol["name"], symbol)
+                        variable_symbols_by_path[ref_path] = variable_symbols
+                    symbol = variable_symbols_by_path[ref_path].get(containing_symbol_name)
+                    if symbol is not None:
+                        containing_symbol = cast(
+                            multilspy_types.UnifiedSymbolInformation, {**symbol, "location": ref, "range": ref["range"]}
+                        )
+
+            # We failed retrieving the symbol, falling back to creating a file symbol
+            if containing_symbol is None and include_file_symbols:
+                self.logger.log(
+                    f"Could not find containing symbol for {ref_path}:{ref_line}:{ref_col}. Returning file symbol instead",
+                    logging.WARNING
                 )
-                if containing_symbol is None:
-                    # TODO: HORRIBLE HACK! I don't know how to do it better for now...
-                    # THIS IS BOUND TO BREAK IN MANY CASES! IT IS ALSO SPECIFIC TO PYTHON!
-                    # Background:
-                    # When a variable is used to change something, like
-                    #
-                    # instance = MyClass()
-                    # instance.status = "new status"
-                    #
-                    # we can't find the containing symbol for the reference to `status`
-                    # since there is no container on the line of the reference
-                    # The hack is to try to find a variable symbol in the containing module
-                    # by using the text of the reference to find the variable name (In a very heuristic way)
-                    # and then look for a symbol with that name and kind Variable
-                    ref_text = file_data.contents.split("\n")[ref_line]
-                    if "." in ref_text:
-                        containing_symbol_name = ref_text.split(".")[0]
-                        all_symbols, _ = await self.request_document_symbols(ref_path)
-                        for symbol in all_symbols:
-                            if symbol["name"] == containing_symbol_name and symbol["kind"] == multilspy_types.SymbolKind.Variable:
-                                containing_symbol = copy(symbol)
-                                containing_symbol["location"] = ref
-                                containing_symbol["range"] = ref["range"]
-                                break
-
-                # We failed retrieving the symbol, falling back to creating a file symbol
-                if containing_symbol is None and include_file_symbols:
-                    self.logger.log(
-                        f"Could not find containing symbol for {ref_path}:{ref_line}:{ref_col}. Returning file symbol instead",
-                        logging.WARNING
-                    )
-                    fileRange = self._get_range_from_file_content(file_data.contents)
-                    location = multilspy_types.Location(
-                        uri=str(pathlib.Path(os.path.join(self.repository_root_path, ref_path)).as_uri()),
-                        range=fileRange,
-                        absolutePath=str(os.path.join(self.repository_root_path, ref_path)),
-                        relativePath=ref_path,
-                    )
-                    name = os.path.splitext(os.path.basename(ref_path))[0]
+                file_content = "\n".join(file_lines)
+                fileRange = self._get_range_from_file_content(file_content)
+                location = multilspy_types.Location(
+                    uri=_file_uri(_absolute_file_path(self.repository_root_path, ref_path)),
+                    range=fileRange,
+                    absolutePath=str(os.path.join(self.repository_root_path, ref_path)),
+                    relativePath=ref_path,
+                )
+                name = os.path.splitext(os.path.basename(ref_path))[0]
 
-                    if include_body:
-                        body = self.retrieve_full_file_content(ref_path)
-                    else:
-                        body = ""
+                if include_body:
+                    body = file_content
+                else:
+                    body = ""
+
+                containing_symbol = multilspy_types.UnifiedSymbolInformation(
+                    kind=multilspy_types.SymbolKind.File,
+                    range=fileRange,
+                    selectionRange=fileRange,
+                    location=location,
+                    name=name,
+                    children=[],
+                    body=body,
+                )
+            if containing_symbol is None or not include_file_symbols and containing_symbol["kind"] == multilspy_types.SymbolKind.File:
+                continue
 
-                    containing_symbol = multilspy_types.UnifiedSymbolInformation(
-                        kind=multilspy_types.SymbolKind.File,
-                        range=fileRange,
-                        selectionRange=fileRange,
-                        location=location,
-                        name=name,
-                        children=[],
-                        body=body,
-                    )
-                if containing_symbol is None or not include_file_symbols and containing_symbol["kind"] == multilspy_types.SymbolKind.File:
+            assert "location" in containing_symbol
+            assert "selectionRange" in containing_symbol
+
+            # Checking for self-reference
+            if (
+                containing_symbol["location"]["relativePath"] == relative_file_path
+                and containing_symbol["selectionRange"]["start"]["line"] == ref_line
+                and containing_symbol["selectionRange"]["start"]["character"] == ref_col
+            ):
+                incoming_symbol = containing_symbol
+                if include_self:
+                    result.append(containing_symbol)
                     continue
-
-                assert "location" in containing_symbol
-                assert "selectionRange" in containing_symbol
-
-                # Checking for self-reference
-                if (
-                    containing_symbol["location"]["relativePath"] == relative_file_path
-                    and containing_symbol["selectionRange"]["start"]["line"] == ref_line
-                    and containing_symbol["selectionRange"]["start"]["character"] == ref_col
-                ):
-                    incoming_symbol = containing_symbol
-                    if include_self:
-                        result.append(containing_symbol)
-                        continue
-                    else:
-                        self.logger.log(f"Found self-reference for {incoming_symbol['name']}, skipping it since {include_self=}", logging.DEBUG)
-                        continue
-
-                # checking whether reference is an import
-                # This is neither really safe nor elegant, but if we don't do it,
-                # there is no way to distinguish between definitions and imports as import is not a symbol-type
-                # and we get the type referenced symbol resulting from imports...
-                if (not include_imports \
-                    and incoming_symbol is not None \
-                    and containing_symbol["name"] == incoming_symbol["name"] \
-                    and containing_symbol["kind"] == incoming_symbol["kind"] \
-                ):
-                    self.logger.log(
-                        f"Found import of referenced symbol {incoming_symbol['name']}" 
-                        f"in {containing_symbol['location']['relativePath']}, skipping",
-                        logging.DEBUG
-                    )
+                else:
+                    self.logger.log(f"Found self-reference for {incoming_symbol['name']}, skipping it since {include_self=}", logging.DEBUG)
                     continue
 
-                result.append(containing_symbol)
+            # checking whether reference is an import
+            # This is neither really safe nor elegant, but if we don't do it,
+            # there is no way to distinguish between definitions and imports as import is not a symbol-type
+            # and we get the type referenced symbol resulting from imports...
+            if (not include_imports \
+                and incoming_symbol is not None \
+                and containing_symbol["name"] == incoming_symbol["name"] \
+                and containing_symbol["kind"] == incoming_symbol["kind"] \
+            ):
+                self.logger.log(
+                    f"Found import of referenced symbol {incoming_symbol['name']}" 
+                    f"in {containing_symbol['location']['relativePath']}, skipping",
+                    logging.DEBUG
+                )
+                continue
+
+            result.append(containing_symbol)
 
         return result
 
@@ -1465,39 +2156,58 @@ class LanguageServer:
         :return: The container symbol (if found) or None.
         """
         # checking if the line is empty, unfortunately ugly and duplicating code, but I don't want to refactor
-        with self.open_file(relative_file_path):
-            absolute_file_path = str(
-                PurePath(self.repository_root_path, relative_file_path)
-            )
-            content = FileUtils.read_file(self.logger, absolute_file_path)
-            if content.split("\n")[line].strip() == "":
+        # (the lines are cached on the buffer, so repeated calls while the file is held open, as done by
+        # request_referencing_symbols, split the file only once)
+        absolute_file_path = _absolute_file_path(self.repository_root_path, relative_file_path)
+        # the file is kept open until the end, such that the body can be taken from the same lines
+        with self.open_file(relative_file_path) as file_data:
+            if file_data.lines[line].strip() == "":
                 self.logger.log(
                     f"Passing empty lines to request_container_symbol is currently not supported, {relative_file_path=}, {line=}",
                     logging.ERROR,
                 )
                 return None
 
-        symbols, _ = await self.request_document_symbols(relative_file_path)
+            symbols, _ = await self.request_document_symbols(relative_file_path)
+
+            cache_key = self._get_document_symbols_cache_key(relative_file_path, False)
+            indexed_symbols, index = self._containing_symbol_indices.get(cache_key, (None, None))
+            if indexed_symbols is not symbols or index is None:
+                index = self._build_containing_symbol_index(symbols, relative_file_path, absolute_file_path)
+                self._containing_symbol_indices[cache_key] = (symbols, index)
 
+            containing_symbol = index.find_innermost_container(line, column, strict)
+            if containing_symbol is not None:
+                self._set_symbol_location_paths(containing_symbol, relative_file_path, absolute_file_path)
+                if include_body:
+                    containing_symbol["body"] = containing_symbol.get("body") or self._get_symbol_body(containing_symbol, file_data.lines)
+            return containing_symbol
+
+    @staticmethod
+    def _set_symbol_location_paths(symbol: multilspy_types.UnifiedSymbolInformation, relative_file_path: str, absolute_file_path: str) -> None:
         # make jedi and pyright api compatible
         # the former has no location, the later has no range
         # we will just always add location of the desired format to all symbols
+        if "location" not in symbol:
+            range = symbol["range"]
+            location = multilspy_types.Location(
+                uri=f"file:/{absolute_file_path}",
+                range=range,
+                absolutePath=absolute_file_path,
+                relativePath=relative_file_path,
+            )
+            symbol["location"] = location
+        else:
+            location = symbol["location"]
+            assert "range" in location
+            location["absolutePath"] = absolute_file_path
+            location["relativePath"] = relative_file_path
+            location["uri"] = _file_uri(absolute_file_path)
+
+    def _build_containing_symbol_index(self, symbols: List[multilspy_types.UnifiedSymbolInformation], relative_file_path: str,
+            absolute_file_path: str) -> _ContainingSymbolIndex:
         for symbol in symbols:
-            if "location" not in symbol:
-                range = symbol["range"]
-                location = multilspy_types.Location(
-                    uri=f"file:/{absolute_file_path}",
-                    range=range,
-                    absolutePath=absolute_file_path,
-                    relativePath=relative_file_path,
-                )
-                symbol["location"] = location
-            else:
-                location = symbol["location"]
-                assert "range" in location
-                location["absolutePath"] = absolute_file_path
-                location["relativePath"] = relative_file_path
-                location["uri"] = Path(absolute_file_path).as_uri()
+            self._set_symbol_location_paths(symbol, relative_file_path, absolute_file_path)
 
         # Allowed container kinds, currently only for Python
         container_symbol_kinds = {
@@ -1506,21 +2216,6 @@ class LanguageServer:
             multilspy_types.SymbolKind.Class
         }
 
-        def is_position_in_range(line: int, range_d: multilspy_types.Range) -> bool:
-            start = range_d["start"]
-            end = range_d["end"]
-
-            column_condition = True
-            if strict:
-                line_condition = end["line"] >= line > start["line"]
-                if column is not None:
-                    column_condition = column > start["character"]
-            else:
-                line_condition = end["line"] >= line >= start["line"]
-                if column is not None:
-                    column_condition = column >= start["character"]
-            return line_condition and column_condition
-
         # Only consider containers that are not one-liners (otherwise we may get imports)
         candidate_containers = [
             s for s in symbols if s["kind"] in container_symbol_kinds and s["location"]["range"]["start"]["line"] != s["location"]["range"]["end"]["line"]
@@ -1529,26 +2224,7 @@ class LanguageServer:
             s for s in symbols if s["kind"] == multilspy_types.SymbolKind.Variable
         ]
         candidate_containers.extend(var_containers)
-
-        if not candidate_containers:
-            return None
-
-        # From the candidates, find those whose range contains the given position.
-        containing_symbols = []
-        for symbol in candidate_containers:
-            s_range = symbol["location"]["range"]
-            if not is_position_in_range(line, s_range):
-                continue
-            containing_symbols.append(symbol)
-
-        if containing_symbols:
-            # Return the one with the greatest starting position (i.e. the innermost container).
-            containing_symbol = max(containing_symbols, key=lambda s: s["location"]["range"]["start"]["line"])
-            if include_body:
-                containing_symbol["body"] = self.retrieve_symbol_body(containing_symbol)
-            return containing_symbol
-        else:
-            return None
+        return _ContainingSymbolIndex(candidate_containers)
 
     async def request_container_of_symbol(self, symbol: multilspy_types.UnifiedSymbolInformation, include_body: bool = False) -> multilspy_types.UnifiedSymbolInformation | None:
         """
@@ -1612,36 +2288,247 @@ class LanguageServer:
 
     @property
     def _cache_path(self) -> Path:
-        return Path(self.repository_root_path) / ".serena" / "cache" / "document_symbols_cache.pkl"
+        return Path(self.repository_root_path) / ".serena" / "cache" / f"document_symbols_cache_v{self._document_symbols_cache_version}.sqlite"
 
-    def save_cache(self):
-        if self._cache_has_changed:
-            self.logger.log(f"Saving updated document symbols cache to {self._cache_path}", logging.INFO)
+    def _get_cache_connection(self, create: bool) -> Optional[sqlite3.Connection]:
+        """
+        :param create: whether to create the cache database if it does not exist yet
+        :return: the connection to the cache database, or None if it does not exist and shall not be created
+        """
+        if self._cache_connection is None:
+            if not create and not self._cache_path.exists():
+                return None
             self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # the connection is shared between the threads loading and saving entries (see `_load_cache_entry` and
+            # `_write_cache_entries`), accesses are serialized through self._cache_lock
+            connection = sqlite3.connect(self._cache_path, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            # entries are read through the memory map instead of with a read call (and copy) per page
+            connection.execute(f"PRAGMA mmap_size={self._document_symbols_cache_mmap_size}")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS document_symbols "
+                "(cache_key TEXT PRIMARY KEY, content_hash TEXT NOT NULL, mtime_ns INTEGER, size INTEGER, data BLOB NOT NULL, "
+                "last_used INTEGER NOT NULL)"
+            )
+            self._cache_connection = connection
+        return self._cache_connection
+
+    async def _cache_get(self, cache_key: str) -> Optional[Tuple[str, Tuple[List[multilspy_types.UnifiedSymbolInformation], List[multilspy_types.UnifiedSymbolInformation]]]]:
+        """
+        Entries which are not held in memory are loaded from the persistent cache in a separate thread, such that the event loop
+        is blocked neither by the query nor by a save of the cache (which holds _cache_lock).
+
+        :return: the tuple (file_content_hash, result_of_request_document_symbols) for the given key, or None if it is not cached
+        """
+        file_hash_and_result = self._document_symbols_cache.get(cache_key)
+        if file_hash_and_result is not None:
+            self._document_symbols_cache.move_to_end(cache_key)
+            return file_hash_and_result
+        loaded_entry = await asyncio.to_thread(self._load_cache_entry, cache_key)
+        if loaded_entry is None:
+            return None
+        # an entry which was added while loading (e.g. by a concurrent request) is more recent than the persisted one
+        file_hash_and_result = self._document_symbols_cache.get(cache_key)
+        if file_hash_and_result is not None:
+            self._document_symbols_cache.move_to_end(cache_key)
+            return file_hash_and_result
+        content_hash, stat_signature, result = loaded_entry
+        file_hash_and_result = (content_hash, result)
+        self._cache_stat_signatures[cache_key] = stat_signature
+        self._used_cache_keys.add(cache_key)
+        self._document_symbols_cache[cache_key] = file_hash_and_result
+        self._evict_cached_document_symbols()
+        return file_hash_and_result
+
+    def _load_cache_entry(self, cache_key: str) \
+            -> Optional[Tuple[str, Optional[Tuple[int, int]], Tuple[List[multilspy_types.UnifiedSymbolInformation], List[multilspy_types.UnifiedSymbolInformation]]]]:
+        """
+        Loads the entry with the given key from the persistent cache. Thread-safe.
+
+        :return: the tuple (file_content_hash, stat_signature, result_of_request_document_symbols), or None if there is no such
+            entry or it cannot be read
+        """
+        with self._cache_lock:
             try:
-                with open(self._cache_path, "wb") as f:
-                    pickle.dump(self._document_symbols_cache, f)
+                connection = self._get_cache_connection(create=False)
+                if connection is None:
+                    return None
+                row = connection.execute(
+                    "SELECT content_hash, mtime_ns, size, data FROM document_symbols WHERE cache_key = ?", (cache_key,)
+                ).fetchone()
             except Exception as e:
-                self.logger.log(
-                        f"Failed to save document symbols cache to {self._cache_path}: {e}. "
-                        "Note: this may have resulted in a corrupted cache file.", logging.ERROR
+                self.logger.log(f"Failed to load document symbols for {cache_key} from {self._cache_path}: {e}", logging.ERROR)
+                return None
+        if row is None:
+            return None
+        content_hash, mtime_ns, size, data = row
+        try:
+            result = pickle.loads(zlib.decompress(data))
+        except Exception as e:
+            # an unreadable entry is treated like a missing one, it will be overwritten on the next save
+            self.logger.log(f"Failed to load document symbols for {cache_key} from {self._cache_path}: {e}", logging.ERROR)
+            return None
+        return content_hash, (mtime_ns, size) if mtime_ns is not None else None, result
+
+    def _cache_put(self, cache_key: str, content_hash: str, stat_signature: Optional[Tuple[int, int]], result: Tuple[List[multilspy_types.UnifiedSymbolInformation], List[multilspy_types.UnifiedSymbolInformation]]) -> None:
+        """
+        :param stat_signature: the stat signature of the file for which the result was computed, or None if the result
+            does not correspond to the contents on disk
+        """
+        self._document_symbols_cache[cache_key] = (content_hash, result)
+        self._document_symbols_cache.move_to_end(cache_key)
+        self._cache_stat_signatures[cache_key] = stat_signature
+        self._dirty_cache_keys.add(cache_key)
+        self._evict_cached_document_symbols()
+
+    def _evict_cached_document_symbols(self) -> None:
+        """
+        Evicts the least recently used entries of the in-memory document symbols cache beyond max_cached_document_symbols.
+        Only entries which are persisted can be evicted (such that they can be loaded again); if unsaved entries remain
+        beyond the limit, the unsaved entries are flushed to the persistent cache in the background and evicted afterwards.
+        """
+        num_excess_entries = len(self._document_symbols_cache) - self.max_cached_document_symbols
+        if num_excess_entries <= 0:
+            return
+        evictable_cache_keys = []
+        for cache_key in self._document_symbols_cache:
+            if len(evictable_cache_keys) == num_excess_entries:
+                break
+            if cache_key not in self._dirty_cache_keys and cache_key not in self._flushing_cache_keys:
+                evictable_cache_keys.append(cache_key)
+        for cache_key in evictable_cache_keys:
+            del self._document_symbols_cache[cache_key]
+            self._cache_stat_signatures.pop(cache_key, None)
+            self._containing_symbol_indices.pop(cache_key, None)
+        if len(evictable_cache_keys) < num_excess_entries and self._dirty_cache_keys:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # not called from the event loop, so saving synchronously does not block any other requests
+                self.save_cache()
+                if not self._dirty_cache_keys:
+                    self._evict_cached_document_symbols()
+                return
+            if self._cache_flush_task is None or self._cache_flush_task.done():
+                self._cache_flush_task = loop.create_task(self._flush_cache())
+
+    async def _flush_cache(self) -> None:
+        """
+        Writes the unsaved entries of the document symbols cache to the persistent cache in a separate thread (such that
+        the event loop is not blocked) and evicts the entries beyond max_cached_document_symbols afterwards.
+        Entries which are added in the meantime are flushed in the next batch.
+        """
+        dirty_cache_keys, used_cache_keys, entries = self._take_unsaved_cache_entries()
+        self._flushing_cache_keys = dirty_cache_keys
+        try:
+            saved = await asyncio.to_thread(self._write_cache_entries, entries, used_cache_keys)
+        finally:
+            self._flushing_cache_keys = set()
+        if not saved:
+            # the entries are kept (marked as dirty) until the next attempt, which is triggered by the next addition
+            self._dirty_cache_keys.update(dirty_cache_keys)
+            self._used_cache_keys.update(used_cache_keys)
+            return
+        self._evict_cached_document_symbols()
+
+    @staticmethod
+    def _get_document_symbols_cache_key(relative_file_path: str, include_body: bool) -> str:
+        return f"{relative_file_path}-{include_body}"
+
+    def save_cache(self):
+        if self._dirty_cache_keys or self._used_cache_keys:
+            dirty_cache_keys, used_cache_keys, entries = self._take_unsaved_cache_entries()
+            if not self._write_cache_entries(entries, used_cache_keys):
+                # keep the entries marked as dirty, such that they are saved on the next attempt
+                self._dirty_cache_keys.update(dirty_cache_keys)
+                self._used_cache_keys.update(used_cache_keys)
+
+    def _take_unsaved_cache_entries(self) -> Tuple[set[str], set[str], List[tuple]]:
+        """
+        Takes the entries which are to be saved, resetting the sets of dirty and used keys.
+
+        :return: the tuple (dirty_cache_keys, used_cache_keys, entries), where the entries are tuples
+            (cache_key, content_hash, stat_signature, result) of the dirty entries
+        """
+        dirty_cache_keys, self._dirty_cache_keys = self._dirty_cache_keys, set()
+        used_cache_keys, self._used_cache_keys = self._used_cache_keys - dirty_cache_keys, set()
+        entries = []
+        for cache_key in dirty_cache_keys:
+            content_hash, result = self._document_symbols_cache[cache_key]
+            entries.append((cache_key, content_hash, self._cache_stat_signatures[cache_key], result))
+        return dirty_cache_keys, used_cache_keys, entries
+
+    def _write_cache_entries(self, entries: List[tuple], used_cache_keys: set[str]) -> bool:
+        """
+        Serializes the given entries (see `_take_unsaved_cache_entries`), writes them to the persistent cache and updates
+        the last use of the entries with the given keys. Thread-safe.
+
+        :return: whether the entries were written successfully
+        """
+        self.logger.log(f"Saving {len(entries)} updated entries of the document symbols cache to {self._cache_path}", logging.INFO)
+        last_used = time.time_ns()
+        rows = []
+        for cache_key, content_hash, stat_signature, result in entries:
+            mtime_ns, size = stat_signature or (None, None)
+            data = zlib.compress(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL), self._document_symbols_cache_compression_level)
+            rows.append((cache_key, content_hash, mtime_ns, size, data, last_used))
+        with self._cache_lock:
+            try:
+                connection = self._get_cache_connection(create=True)
+                assert connection is not None
+                with connection:
+                    connection.execute("BEGIN")
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO document_symbols (cache_key, content_hash, mtime_ns, size, data, last_used) "
+                        "VALUES (?, ?, ?, ?, ?, ?)", rows
+                    )
+                    connection.executemany(
+                        "UPDATE document_symbols SET last_used = ? WHERE cache_key = ?",
+                        ((last_used, cache_key) for cache_key in used_cache_keys)
                     )
+                    num_excess_entries = connection.execute("SELECT COUNT(*) FROM document_symbols").fetchone()[0] \
+                        - self.max_persisted_document_symbols
+                    if num_excess_entries > 0:
+                        connection.execute(
+                            "DELETE FROM document_symbols WHERE cache_key IN "
+                            "(SELECT cache_key FROM document_symbols ORDER BY last_used LIMIT ?)",
+                            (num_excess_entries,)
+                        )
+                return True
+            except Exception as e:
+                self.logger.log(f"Failed to save document symbols cache to {self._cache_path}: {e}", logging.ERROR)
+                return False
 
     def load_cache(self):
-        if not self._cache_path.exists():
-            return
-        self.logger.log(f"Loading document symbols cache from {self._cache_path}", logging.INFO)
-        with open(self._cache_path, "rb") as f:
+        """
+        Opens the persistent document symbols cache, if it exists. Entries are loaded lazily when they are requested.
+        """
+        with self._cache_lock:
             try:
-                self._document_symbols_cache = pickle.load(f)
+                if self._get_cache_connection(create=False) is not None:
+                    self.logger.log(f"Using document symbols cache in {self._cache_path}", logging.INFO)
             except Exception as e:
-                # cache often becomes corrupt, so just skip loading it
+                # cache can become corrupt, so just skip using it
                 self.logger.log(
-                        f"Failed to load document symbols cache from {self._cache_path}: {e}. Possible cause: the cache file is corrupted. " 
+                        f"Failed to open document symbols cache in {self._cache_path}: {e}. Possible cause: the cache file is corrupted. "
                         "Check for any errors related to saving the cache in the logs.",
                         logging.ERROR
                     )
 
+    def _close_cache_connection(self) -> None:
+        """
+        Closes the connection to the persistent document symbols cache (if it is open), which also removes SQLite's
+        temporary files next to the database. The connection is reopened when the cache is accessed again.
+        """
+        with self._cache_lock:
+            if self._cache_connection is not None:
+                try:
+                    self._cache_connection.close()
+                except Exception as e:
+                    self.logger.log(f"Failed to close document symbols cache in {self._cache_path}: {e}", logging.ERROR)
+                self._cache_connection = None
+
     async def request_document_diagnostic(
         self, 
         relative_file_path: str, 
@@ -1662,7 +2549,7 @@ class LanguageServer:
         with self.open_file(relative_file_path):
             code_action_params = lsp_types.DocumentDiagnosticParams(
                 textDocument=lsp_types.TextDocumentIdentifier(
-                    uri=pathlib.Path(os.path.join(self.repository_root_path, relative_file_path)).as_uri()
+                    uri=_file_uri(_absolute_file_path(self.repository_root_path, relative_file_path))
                 ),
             )
             response = await self.server.send.text_document_diagnostic(code_action_params)
@@ -1702,7 +2589,7 @@ class LanguageServer:
         with self.open_file(relative_file_path):
             code_action_params = lsp_types.CodeActionParams(
                 textDocument=lsp_types.TextDocumentIdentifier(
-                    uri=pathlib.Path(os.path.join(self.repository_root_path, relative_file_path)).as_uri()
+                    uri=_file_uri(_absolute_file_path(self.repository_root_path, relative_file_path))
                 ),
                 range=lsp_types.Range(
                     start=lsp_types.Position(line=start_line, character=start_column),
@@ -1750,9 +2637,9 @@ class LanguageServer:
             assert LSPConstants.KIND in item
             assert LSPConstants.LOCATION in item
 
-            # Enrich the item with path information
+            # Enrich the item with path information (in place, the response is not referenced elsewhere, so no copy is needed)
             enriched_item = self._path_mapper.enrich_symbol(item)
-            ret.append(multilspy_types.UnifiedSymbolInformation(**enriched_item))
+            ret.append(cast(multilspy_types.UnifiedSymbolInformation, enriched_item))
 
         return ret
 
@@ -1796,6 +2683,16 @@ class SyncLanguageServer:
         """
         return SyncLanguageServer(LanguageServer.create(config, logger, repository_root_path, add_gitignore_content_to_config=add_gitignore_content_to_config), timeout=timeout)
 
+    def _submit(self, coro: Awaitable[Any]) -> concurrent.futures.Future:
+        """
+        Schedules the given coroutine on the event loop of the language server without waiting for its result.
+
+        :param coro: the coroutine to run
+        :return: the future holding the coroutine's result
+        """
+        assert self.loop
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
     @contextmanager
     def open_file(self, relative_file_path: str) -> Iterator[LSPFileBuffer]:
         """
@@ -1859,11 +2756,26 @@ class SyncLanguageServer:
 
         :return List[multilspy_types.Location]: A list of locations where the symbol is defined
         """
-        result = asyncio.run_coroutine_threadsafe(
-            self.language_server.request_definition(file_path, line, column), self.loop
-        ).result(timeout=self.timeout)
+        result = self._submit(self.language_server.request_definition(file_path, line, column)).result(timeout=self.timeout)
         return result
 
+    def request_definition_async(self, file_path: str, line: int, column: int) -> "concurrent.futures.Future[List[multilspy_types.Location]]":
+        """
+        Like `request_definition`, but returns immediately with a future for the result, such that several requests
+        can be sent concurrently (e.g. collected via `concurrent.futures.as_completed`).
+        """
+        return self._submit(self.language_server.request_definition(file_path, line, column))
+
+    def request_definition_many(self, positions: List[Tuple[str, int, int]]) -> List[List[multilspy_types.Location]]:
+        """
+        Like `request_definition`, but for several positions at once: the requests are sent concurrently
+        within a single call to the event loop, instead of waiting for each request before scheduling the next one.
+
+        :param positions: the positions as tuples (relative_file_path, line, column)
+        :return: the definitions for each of the positions (see `request_definition`), in the order of the positions
+        """
+        return self._submit(self.language_server.request_definition_many(positions)).result(timeout=self.timeout)
+
     def request_references(self, file_path: str, line: int, column: int) -> List[multilspy_types.Location]:
         """
         Raise a [textDocument/references](https://microsoft.github.io/language-server-protocol/specifications/lsp/3.17/specification/#textDocument_references) request to the Language Server
@@ -1876,9 +2788,7 @@ class SyncLanguageServer:
         :return List[multilspy_types.Location]: A list of locations where the symbol is referenced
         """
         try:
-            result = asyncio.run_coroutine_threadsafe(
-                self.language_server.request_references(file_path, line, column), self.loop
-            ).result(timeout=self.timeout)
+            result = self._submit(self.language_server.request_references(file_path, line, column)).result(timeout=self.timeout)
         except Exception as e:
             from multilspy.lsp_protocol_handler.server import Error
             if isinstance(e, Error) and getattr(e, 'code', None) == -32603:
@@ -1889,6 +2799,23 @@ class SyncLanguageServer:
             raise
         return result
 
+    def request_references_async(self, file_path: str, line: int, column: int) -> "concurrent.futures.Future[List[multilspy_types.Location]]":
+        """
+        Like `request_references`, but returns immediately with a future for the result, such that several requests
+        can be sent concurrently (e.g. collected via `concurrent.futures.as_completed`).
+        """
+        return self._submit(self.language_server.request_references(file_path, line, column))
+
+    def request_references_many(self, positions: List[Tuple[str, int, int]]) -> List[List[multilspy_types.Location]]:
+        """
+        Like `request_references`, but for several positions at once: the requests are sent concurrently
+        within a single call to the event loop, instead of waiting for each request before scheduling the next one.
+
+        :param positions: the positions as tuples (relative_file_path, line, column)
+        :return: the references for each of the positions (see `request_references`), in the order of the positions
+        """
+        return self._submit(self.language_server.request_references_many(positions)).result(timeout=self.timeout)
+
 
     def request_references_with_content(
         self, relative_file_path: str, line: int, column: int, context_lines_before: int = 0, context_lines_after: int = 0
@@ -1904,9 +2831,7 @@ class SyncLanguageServer:
 
         :return: A list of MatchedConsecutiveLines objects, one for each reference.
         """
-        result = asyncio.run_coroutine_threadsafe(
-            self.language_server.request_references_with_content(relative_file_path, line, column, context_lines_before, context_lines_after), self.loop
-        ).result()
+        result = self._submit(self.language_server.request_references_with_content(relative_file_path, line, column, context_lines_before, context_lines_after)).result()
         return result
 
     def request_completions(
@@ -1922,10 +2847,7 @@ class SyncLanguageServer:
 
         :return List[multilspy_types.CompletionItem]: A list of completions
         """
-        result = asyncio.run_coroutine_threadsafe(
-            self.language_server.request_completions(relative_file_path, line, column, allow_incomplete),
-            self.loop,
-        ).result(timeout=self.timeout)
+        result = self._submit(self.language_server.request_completions(relative_file_path, line, column, allow_incomplete)).result(timeout=self.timeout)
         return result
 
     def request_document_symbols(self, relative_file_path: str, include_body: bool = False) -> Tuple[List[multilspy_types.UnifiedSymbolInformation], List[multilspy_types.UnifiedSymbolInformation]]:
@@ -1937,11 +2859,17 @@ class SyncLanguageServer:
         :param include_body: whether to include the body of the symbols in the result.
         :return: A list of symbols in the file, and a list of root symbols that represent the tree structure of the symbols. Each symbol in hierarchy starting from the roots has a children attribute.
         """
-        result = asyncio.run_coroutine_threadsafe(
-            self.language_server.request_document_symbols(relative_file_path, include_body), self.loop
-        ).result()
+        result = self._submit(self.language_server.request_document_symbols(relative_file_path, include_body)).result()
         return result
 
+    def request_document_symbols_async(self, relative_file_path: str, include_body: bool = False) \
+            -> "concurrent.futures.Future[Tuple[List[multilspy_types.UnifiedSymbolInformation], List[multilspy_types.UnifiedSymbolInformation]]]":
+        """
+        Like `request_document_symbols`, but returns immediately with a future for the result, such that several requests
+        can be sent concurrently (e.g. collected via `concurrent.futures.as_completed`).
+        """
+        return self._submit(self.language_server.request_document_symbols(relative_file_path, include_body))
+
     def request_full_symbol_tree(self, within_relative_path: str | None = None, include_body: bool = False) -> List[multilspy_types.UnifiedSymbolInformation]:
         """
         Will go through all files in the project and build a tree of symbols. Note: this may be slow the first time it is called.
@@ -1960,9 +2888,7 @@ class SyncLanguageServer:
 
         :return: A list of root symbols representing the top-level packages/modules in the project.
         """
-        result = asyncio.run_coroutine_threadsafe(
-            self.language_server.request_full_symbol_tree(within_relative_path, include_body), self.loop
-        ).result(timeout=self.timeout)
+        result = self._submit(self.language_server.request_full_symbol_tree(within_relative_path, include_body)).result(timeout=self.timeout)
         return result
 
     def request_dir_overview(self, relative_dir_path: str) -> dict[str, list[tuple[str, multilspy_types.SymbolKind, int, int]]]:
@@ -1972,10 +2898,7 @@ class SyncLanguageServer:
         Maps relative paths of all contained files to info about top-level symbols in the file
         (name, kind, line, column).
         """
-        assert self.loop
-        result = asyncio.run_coroutine_threadsafe(
-            self.language_server.request_dir_overview(relative_dir_path), self.loop
-        ).result(timeout=self.timeout)
+        result = self._submit(self.language_server.request_dir_overview(relative_dir_path)).result(timeout=self.timeout)
         return result
 
     def request_document_overview(self, relative_file_path: str) -> list[tuple[str, multilspy_types.SymbolKind, int, int]]:
@@ -1984,10 +2907,7 @@ class SyncLanguageServer:
 
         Returns the list of tuples (name, kind, line, column) of all top-level symbols in the file.
         """
-        assert self.loop
-        result = asyncio.run_coroutine_threadsafe(
-            self.language_server.request_document_overview(relative_file_path), self.loop
-        ).result(timeout=self.timeout)
+        result = self._submit(self.language_server.request_document_overview(relative_file_path)).result(timeout=self.timeout)
         return result
 
     def request_overview(self, within_relative_path: str) -> dict[str, list[tuple[str, multilspy_types.SymbolKind, int, int]]]:
@@ -1997,10 +2917,7 @@ class SyncLanguageServer:
         :param within_relative_path: the relative path to the file or directory to get the overview of.
         :return: A mapping of all relative paths analyzed to lists of tuples (name, kind, line, column) of all top-level symbols in the corresponding file.
         """
-        assert self.loop
-        result = asyncio.run_coroutine_threadsafe(
-            self.language_server.request_overview(within_relative_path), self.loop
-        ).result()
+        result = self._submit(self.language_server.request_overview(within_relative_path)).result()
         return result
 
     def request_hover(self, relative_file_path: str, line: int, column: int) -> Union[multilspy_types.Hover, None]:
@@ -2014,11 +2931,16 @@ class SyncLanguageServer:
 
         :return None
         """
-        result = asyncio.run_coroutine_threadsafe(
-            self.language_server.request_hover(relative_file_path, line, column), self.loop
-        ).result(timeout=self.timeout)
+        result = self._submit(self.language_server.request_hover(relative_file_path, line, column)).result(timeout=self.timeout)
         return result
 
+    def request_hover_async(self, relative_file_path: str, line: int, column: int) -> "concurrent.futures.Future[Union[multilspy_types.Hover, None]]":
+        """
+        Like `request_hover`, but returns immediately with a future for the result, such that several requests
+        can be sent concurrently (e.g. collected via `concurrent.futures.as_completed`).
+        """
+        return self._submit(self.language_server.request_hover(relative_file_path, line, column))
+
     def request_document_diagnostic(
         self, 
         relative_file_path: str, 
@@ -2029,12 +2951,10 @@ class SyncLanguageServer:
         :param relative_file_path: The relative path to the file
         :return: List of RelatedFullDocumentDiagnosticReport or RelatedUnchangedDocumentDiagnosticReport
         """
-        assert self.loop
-        result = asyncio.run_coroutine_threadsafe(
+        result = self._submit(
             self.language_server.request_document_diagnostic(
                 relative_file_path=relative_file_path,
-            ),
-            self.loop
+            )
         ).result(timeout=self.timeout)
         return result
 
@@ -2059,8 +2979,7 @@ class SyncLanguageServer:
         :param diagnostics: Optional list of diagnostics to include in the code action context
         :return: List of commands or code actions, or None if no actions are available
         """
-        assert self.loop
-        result = asyncio.run_coroutine_threadsafe(
+        result = self._submit(
             self.language_server.request_code_action(
                 relative_file_path=relative_file_path,
                 start_line=start_line,
@@ -2068,8 +2987,7 @@ class SyncLanguageServer:
                 end_line=end_line,
                 end_column=end_column,
                 diagnostics=diagnostics
-            ),
-            self.loop
+            )
         ).result(timeout=self.timeout)
         return result
 
@@ -2082,11 +3000,16 @@ class SyncLanguageServer:
 
         :return Union[List[multilspy_types.UnifiedSymbolInformation], None]: A list of matching symbols
         """
-        result = asyncio.run_coroutine_threadsafe(
-            self.language_server.request_workspace_symbol(query), self.loop
-        ).result(timeout=self.timeout)
+        result = self._submit(self.language_server.request_workspace_symbol(query)).result(timeout=self.timeout)
         return result
 
+    def request_workspace_symbol_async(self, query: str) -> "concurrent.futures.Future[Union[List[multilspy_types.UnifiedSymbolInformation], None]]":
+        """
+        Like `request_workspace_symbol`, but returns immediately with a future for the result, such that several requests
+        can be sent concurrently (e.g. collected via `concurrent.futures.as_completed`).
+        """
+        return self._submit(self.language_server.request_workspace_symbol(query))
+
     # ----------------------------- FROM HERE ON MODIFICATIONS BY MISCHA --------------------
 
     def retrieve_symbol_body(self, symbol: multilspy_types.UnifiedSymbolInformation) -> str:
@@ -2102,10 +3025,7 @@ class SyncLanguageServer:
         """This is slow, as it finds all files by finding all symbols.
 
         This seems to be the only way, the LSP does not provide any endpoints for listing project files."""
-        assert self.loop
-        result = asyncio.run_coroutine_threadsafe(
-            self.language_server.request_parsed_files(), self.loop
-        ).result()
+        result = self._submit(self.language_server.request_parsed_files()).result()
         return result
 
     def request_referencing_symbols(
@@ -2132,8 +3052,7 @@ class SyncLanguageServer:
             is often a fallback mechanism for when the reference cannot be resolved to a symbol.
         :return: List of symbols that reference the target symbol.
         """
-        assert self.loop
-        result = asyncio.run_coroutine_threadsafe(
+        result = self._submit(
             self.language_server.request_referencing_symbols(
                 relative_file_path,
                 line,
@@ -2142,8 +3061,7 @@ class SyncLanguageServer:
                 include_self=include_self,
                 include_body=include_body,
                 include_file_symbols=include_file_symbols,
-            ),
-            self.loop
+            )
         ).result(timeout=self.timeout)
         return result
 
@@ -2178,10 +3096,7 @@ class SyncLanguageServer:
         :param include_body: whether to include the body of the symbol in the result.
         :return: The container symbol (if found) or None.
         """
-        assert self.loop
-        result = asyncio.run_coroutine_threadsafe(
-            self.language_server.request_containing_symbol(relative_file_path, line, column=column, strict=strict, include_body=include_body), self.loop
-        ).result(timeout=self.timeout)
+        result = self._submit(self.language_server.request_containing_symbol(relative_file_path, line, column=column, strict=strict, include_body=include_body)).result(timeout=self.timeout)
         return result
 
     def request_container_of_symbol(self, symbol: multilspy_types.UnifiedSymbolInformation, include_body: bool = False) -> multilspy_types.UnifiedSymbolInformation | None:
@@ -2191,10 +3106,7 @@ class SyncLanguageServer:
         :param symbol: The symbol to find the container of.
         :param include_body: whether to include the body of the symbol in the result.
         """
-        assert self.loop
-        result = asyncio.run_coroutine_threadsafe(
-            self.language_server.request_container_of_symbol(symbol, include_body=include_body), self.loop
-        ).result(timeout=self.timeout)
+        result = self._submit(self.language_server.request_container_of_symbol(symbol, include_body=include_body)).result(timeout=self.timeout)
         return result
 
     def request_defining_symbol(
@@ -2213,10 +3125,7 @@ class SyncLanguageServer:
         :param include_body: whether to include the body of the symbol in the result.
         :return: The symbol information for the definition, or None if not found.
         """
-        assert self.loop
-        result = asyncio.run_coroutine_threadsafe(
-            self.language_server.request_defining_symbol(relative_file_path, line, column, include_body=include_body), self.loop
-        ).result(timeout=self.timeout)
+        result = self._submit(self.language_server.request_defining_symbol(relative_file_path, line, column, include_body=include_body)).result(timeout=self.timeout)
         return result
 
     def retrieve_full_file_content(self, relative_file_path: str) -> str:
@@ -2255,10 +3164,7 @@ class SyncLanguageServer:
         :param paths_exclude_glob: Glob pattern to filter which files to exclude from the search. Takes precedence over paths_include_glob.
         :return: List of matched consecutive lines with context
         """
-        assert self.loop
-        result = asyncio.run_coroutine_threadsafe(
-            self.language_server.search_files_for_pattern(pattern, context_lines_before, context_lines_after, paths_include_glob, paths_exclude_glob), self.loop
-        ).result(timeout=self.timeout)
+        result = self._submit(self.language_server.search_files_for_pattern(pattern, context_lines_before, context_lines_after, paths_include_glob, paths_exclude_glob)).result(timeout=self.timeout)
         return result
 
     def start(self) -> "SyncLanguageServer":
@@ -2291,12 +3197,37 @@ class SyncLanguageServer:
             return
 
         assert self.loop
-        asyncio.run_coroutine_threadsafe(self._server_context.__aexit__(None, None, None), loop=self.loop).result()
-        self.loop.call_soon_threadsafe(self.loop.stop)
-        self.loop_thread.join()
-        self.loop = None
-        self.loop_thread = None
+        # the unsaved entries of the document symbols cache are taken on the event loop (such that no request modifies them
+        # concurrently) and written while the language server process shuts down (the shutdown does not touch the cache)
+        async def take_unsaved_cache_entries() -> Tuple[set[str], set[str], List[tuple]]:
+            return self.language_server._take_unsaved_cache_entries()
+
+        dirty_cache_keys, used_cache_keys, entries = self._submit(take_unsaved_cache_entries()).result()
+        saved = True
+
+        def write_cache_entries() -> None:
+            nonlocal saved
+            saved = self.language_server._write_cache_entries(entries, used_cache_keys)
+
+        save_cache_thread = threading.Thread(target=write_cache_entries, name="save-document-symbols-cache")
+        if dirty_cache_keys or used_cache_keys:
+            save_cache_thread.start()
+        try:
+            asyncio.run_coroutine_threadsafe(self._server_context.__aexit__(None, None, None), loop=self.loop).result()
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.loop_thread.join()
+            self.loop = None
+            self.loop_thread = None
+        finally:
+            if save_cache_thread.is_alive():
+                save_cache_thread.join()
+        if not saved:
+            # keep the entries marked as dirty, such that they are saved below
+            self.language_server._dirty_cache_keys.update(dirty_cache_keys)
+            self.language_server._used_cache_keys.update(used_cache_keys)
+        # entries which were added during the shutdown are saved now that the event loop has stopped
         self.save_cache()
+        self.language_server._close_cache_connection()
 
     def save_cache(self):
         """
@@ -36,6 +36,12 @@ import os
 import psutil
 from typing import Any, Dict, List, Optional, Union
 
+try:
+    # optional, considerably faster decoding of large responses (e.g. document or workspace symbols)
+    import orjson
+except ImportError:
+    orjson = None
+
 from .lsp_requests import LspNotification, LspRequest
 from .lsp_types import ErrorCodes
 from ..multilspy_exceptions import MultilspyException
@@ -99,11 +105,26 @@ class StopLoopException(Exception):
     pass
 
 
+# json.dumps creates a new encoder whenever non-default options are passed, so a single instance is reused
+_JSON_ENCODER = json.JSONEncoder(check_circular=False, ensure_ascii=False, separators=(",", ":"))
+_CONTENT_TYPE_HEADER = "Content-Type: application/vscode-jsonrpc; charset=utf-8\r\n\r\n".encode(ENCODING)
+
+
+def _decode_json(body: bytes) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            # orjson is stricter than the standard decoder (e.g. regarding NaN or integers beyond 64 bits)
+            pass
+    return json.loads(body)
+
+
 def create_message(payload: PayloadLike):
-    body = json.dumps(payload, check_circular=False, ensure_ascii=False, separators=(",", ":")).encode(ENCODING)
+    body = _JSON_ENCODER.encode(payload).encode(ENCODING)
     return (
         f"Content-Length: {len(body)}\r\n".encode(ENCODING),
-        "Content-Type: application/vscode-jsonrpc; charset=utf-8\r\n\r\n".encode(ENCODING),
+        _CONTENT_TYPE_HEADER,
         body,
     )
 
@@ -419,7 +440,7 @@ class LanguageServerHandler:
         Parse the body text received from the language server process and invoke the appropriate handler
         """
         try:
-            await self._receive_payload(json.loads(body))
+            await self._receive_payload(_decode_json(body))
         except IOError as ex:
             self._log(f"malformed {ENCODING}: {ex}")
         except UnicodeDecodeError as ex:
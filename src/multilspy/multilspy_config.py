@@ -2,6 +2,8 @@
 Configuration parameters for Multilspy.
 """
 import fnmatch
+import os
+import re
 from enum import Enum
 from typing import List
 from dataclasses import dataclass, field
@@ -13,12 +15,13 @@ class FilenameMatcher:
         :param patterns: fnmatch-compatible patterns
         """
         self.patterns = patterns
+        # the patterns are combined into a single regex, which is equivalent to applying fnmatch.fnmatch for each pattern
+        self._regex = re.compile("|".join(fnmatch.translate(os.path.normcase(pattern)) for pattern in patterns)) if patterns else None
 
     def is_relevant_filename(self, fn: str) -> bool:
-        for pattern in self.patterns:
-            if fnmatch.fnmatch(fn, pattern):
-                return True
-        return False
+        if self._regex is None:
+            return False
+        return self._regex.match(os.path.normcase(fn)) is not None
 
 
 class Language(str, Enum):
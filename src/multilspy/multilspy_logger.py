@@ -34,18 +34,22 @@ class MultilspyLogger:
         """
         Log the debug and santized messages using the logger
         """
+        # messages below the logger's level would be discarded anyway, so they are not processed at all
+        # (this method is called on hot paths with debug messages)
+        if not self.logger.isEnabledFor(level):
+            return
 
         debug_message = debug_message.replace("'", '"').replace("\n", " ")
         sanitized_error_message = sanitized_error_message.replace("'", '"').replace("\n", " ")
 
-        # Collect details about the callee
-        curframe = inspect.currentframe()
-        calframe = inspect.getouterframes(curframe, 2)
-        caller_file = calframe[1][1].split("/")[-1]
-        caller_line = calframe[1][2]
-        caller_name = calframe[1][3]
-
         if self.json_format:
+            # Collect details about the callee (from the caller's frame directly, since inspect.getouterframes
+            # would also load the source lines of all outer frames)
+            calframe = inspect.currentframe().f_back  # type: ignore
+            caller_file = calframe.f_code.co_filename.split("/")[-1]
+            caller_line = calframe.f_lineno
+            caller_name = calframe.f_code.co_name
+
             # Construct the debug log line
             debug_log_line = LogLine(
                 time=str(datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
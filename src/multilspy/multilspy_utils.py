@@ -6,7 +6,6 @@ import gzip
 import logging
 import os
 from typing import Tuple, Union
-import requests
 import shutil
 import uuid
 
@@ -48,11 +47,11 @@ class TextUtils:
         Returns the index of the given zero-indexed line and column number in the given text
         """
         idx = 0
-        while line > 0:
-            assert idx < len(text), (idx, len(text), text)
-            if text[idx] == "\n":
-                line -= 1
-            idx += 1
+        for _ in range(line):
+            # str.find scans for the line break in C instead of stepping through the characters in Python
+            newline_idx = text.find("\n", idx)
+            assert newline_idx != -1, (idx, len(text), text)
+            idx = newline_idx + 1
         idx += col
         return idx
     
@@ -150,6 +149,10 @@ class FileUtils:
         """
         Downloads the file from the given URL to the given {target_path}
         """
+        # requests takes a considerable share of the import time of multilspy, but is only needed for
+        # downloading runtime dependencies, so it is imported lazily
+        import requests
+
         try:
             response = requests.get(url, stream=True, timeout=60)
             if response.status_code != 200:
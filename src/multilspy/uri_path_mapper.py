@@ -6,7 +6,7 @@ Provides transformation of standard LSP responses to include relativePath inform
 import logging
 import os
 import pathlib
-import json
+import urllib.parse
 
 from pathlib import Path, PurePath
 from typing import Dict, Optional, Union, Any, List, Tuple, cast
@@ -37,6 +37,13 @@ class UriPathMapper:
         self._uri_to_absolute_path: Dict[str, str] = {}
         self._uri_to_relative_path: Dict[str, str] = {}
         self._abs_to_relative_path: Dict[str, str] = {}
+
+        # URIs of files in the repository start with the URI of the repository root, and for these
+        # the relative path can be obtained without fully parsing the URI
+        self._root_uri_prefix: Optional[str] = None
+        if os.name != "nt" and os.path.isabs(repository_root_path):
+            root_uri = pathlib.Path(repository_root_path).as_uri()
+            self._root_uri_prefix = root_uri if root_uri.endswith("/") else root_uri + "/"
         
     def uri_to_absolute_path(self, uri: str) -> str:
         """
@@ -76,15 +83,29 @@ class UriPathMapper:
         """
         if uri in self._uri_to_relative_path:
             return self._uri_to_relative_path[uri]
-        
-        absolute_path = self.uri_to_absolute_path(uri)
-        relative_path = self.absolute_to_relative_path(absolute_path)
+
+        relative_path = self._uri_to_relative_path_by_root_uri_prefix(uri)
+        if relative_path is None:
+            absolute_path = self.uri_to_absolute_path(uri)
+            relative_path = self.absolute_to_relative_path(absolute_path)
         
         if relative_path:
             self._uri_to_relative_path[uri] = relative_path
         
         return relative_path
     
+    def _uri_to_relative_path_by_root_uri_prefix(self, uri: str) -> Optional[str]:
+        """
+        :return: the relative path for a URI starting with the repository root URI, or None if the URI
+            does not start with it (or refers to a path outside of the repository)
+        """
+        if self._root_uri_prefix is None or not uri.startswith(self._root_uri_prefix):
+            return None
+        relative_path = os.path.normpath(urllib.parse.unquote(uri[len(self._root_uri_prefix):]))
+        if relative_path.startswith(".."):
+            return None
+        return relative_path
+
     def clear_cache(self) -> None:
         """Clear all cached path mappings."""
         self._uri_to_absolute_path.clear()
@@ -99,9 +120,6 @@ class UriPathMapper:
         :return: The enriched Location object
         """
 
-        dataDumped = json.dumps(location)
-        self.logger.log(f"URLPATH - enrich_location: {dataDumped} has returned.", logging.INFO)
-
         if not location or "uri" not in location:
             return location
         
@@ -125,10 +143,7 @@ class UriPathMapper:
         """
         if not symbol:
             return symbol
-        
-        dataDumped = json.dumps(symbol)
-        self.logger.log(f"URLPATH - enrich_symbol: {dataDumped} has returned.", logging.INFO)
-            
+
         # For document symbols that may not have a location but have a range
         if "location" not in symbol and "range" in symbol and default_relative_path:
             absolute_path = os.path.join(self.repository_root_path, default_relative_path)
@@ -1,8 +1,11 @@
 import logging
 import re
-from collections.abc import Callable
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import StrEnum
+from itertools import islice
 
 from pathspec import PathSpec
 from pathspec.patterns.gitwildmatch import GitWildMatchPattern
@@ -150,24 +153,31 @@ def search_text(
         # Pattern is already a compiled regex
         compiled_pattern = pattern
 
-    # Split the content into lines for processing
-    lines = content.splitlines()
-    total_lines = len(lines)
-
     if allow_multiline_match:
         # For multiline matches, we need to use the DOTALL flag to make '.' match newlines
         if isinstance(pattern, str):
             # If we've compiled the pattern ourselves, we need to recompile with DOTALL
             pattern_str = compiled_pattern.pattern
             compiled_pattern = re.compile(pattern_str, re.DOTALL)
+        # The content is split into lines only once there is a match (most searched contents have none)
+        lines: list[str] | None = None
+        total_lines = 0
+        # The line numbers are determined incrementally (the matches are ordered by their start positions),
+        # such that the content before each match is not scanned again
+        counted_pos = 0
+        counted_line_num = 1
         # Search across the entire content as a single string
         for match in compiled_pattern.finditer(content):
             start_pos = match.start()
             end_pos = match.end()
+            if lines is None:
+                lines = content.splitlines()
+                total_lines = len(lines)
 
             # Find the line numbers for the start and end positions
-            start_line_num = content[:start_pos].count("\n") + 1
-            end_line_num = content[:end_pos].count("\n") + 1
+            start_line_num = counted_line_num + content.count("\n", counted_pos, start_pos)
+            end_line_num = start_line_num + content.count("\n", start_pos, end_pos)
+            counted_pos, counted_line_num = start_pos, start_line_num
 
             # Calculate the range of lines to include in the context
             context_start = max(1, start_line_num - context_lines_before)
@@ -189,6 +199,8 @@ def search_text(
             matches.append(MatchedConsecutiveLines(lines=context_lines, source_file_path=source_file_path))
     else:
         # Search line by line
+        lines = content.splitlines()
+        total_lines = len(lines)
         for i, line in enumerate(lines):
             line_num = i + 1
             if compiled_pattern.search(line):
@@ -228,6 +240,7 @@ def search_files(
     context_lines_after: int = 0,
     paths_include_glob: str | None = None,
     paths_exclude_glob: str | None = None,
+    max_workers: int = 1,
 ) -> list[MatchedConsecutiveLines]:
     """
     Search for a pattern in a list of files.
@@ -240,12 +253,15 @@ def search_files(
     :param context_lines_after: Number of context lines to include after matches
     :param paths_include_glob: Optional glob pattern to include files from the list
     :param paths_exclude_glob: Optional glob pattern to exclude files from the list
+    :param max_workers: Number of threads reading the files concurrently (while the contents are searched in the calling thread
+        in the order of the files). If greater than 1, the file_reader must be thread-safe.
     :return: List of MatchedConsecutiveLines objects
     """
     matches = []
     include_spec = PathSpec.from_lines(GitWildMatchPattern, [paths_include_glob]) if paths_include_glob else None
     exclude_spec = PathSpec.from_lines(GitWildMatchPattern, [paths_exclude_glob]) if paths_exclude_glob else None
     skipped_file_error_tuples: list[tuple[str, str]] = []
+    filtered_file_paths = []
     for path in file_paths:
         if include_spec and not include_spec.match_file(path):
             log.debug(f"Skipping {path}: does not match include pattern {paths_include_glob}")
@@ -253,23 +269,57 @@ def search_files(
         if exclude_spec and exclude_spec.match_file(path):
             log.debug(f"Skipping {path}: matches exclude pattern {paths_exclude_glob}")
             continue
+        filtered_file_paths.append(path)
+
+    def read_file(path: str) -> tuple[str | None, str | None]:
+        """:return: a tuple (file_content, error), where exactly one of the elements is not None"""
         try:
-            file_content = file_reader(path)
+            return file_reader(path), None
         except Exception as e:
-            skipped_file_error_tuples.append((path, str(e)))
-            continue
-
-        search_results = search_text(
-            pattern,
-            file_content,
-            source_file_path=path,
-            allow_multiline_match=True,
-            context_lines_before=context_lines_before,
-            context_lines_after=context_lines_after,
+            return None, str(e)
+
+    def read_files_ahead(executor: ThreadPoolExecutor) -> Iterator[tuple[str | None, str | None]]:
+        """
+        Reads the files in the executor, yielding the results in the order of the files.
+        At most 2 * max_workers reads are pending at any time, such that the contents of the files which are read ahead
+        (and not yet searched) do not pile up in memory.
+        """
+        path_iter = iter(filtered_file_paths)
+        pending_reads: deque[Future[tuple[str | None, str | None]]] = deque(
+            executor.submit(read_file, path) for path in islice(path_iter, 2 * max_workers)
+        )
+        while pending_reads:
+            read_result = pending_reads.popleft().result()
+            next_path = next(path_iter, None)
+            if next_path is not None:
+                pending_reads.append(executor.submit(read_file, next_path))
+            yield read_result
+
+    # with an executor, the files are read ahead while the contents of the previous files are searched
+    executor = ThreadPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+    try:
+        read_results: Iterable[tuple[str | None, str | None]] = (
+            read_files_ahead(executor) if executor is not None else map(read_file, filtered_file_paths)
         )
-        if len(search_results) > 0:
-            log.debug(f"Found {len(search_results)} matches in {path}")
-            matches.extend(search_results)
+        for path, (file_content, error) in zip(filtered_file_paths, read_results, strict=True):
+            if file_content is None:
+                skipped_file_error_tuples.append((path, str(error)))
+                continue
+
+            search_results = search_text(
+                pattern,
+                file_content,
+                source_file_path=path,
+                allow_multiline_match=True,
+                context_lines_before=context_lines_before,
+                context_lines_after=context_lines_after,
+            )
+            if len(search_results) > 0:
+                log.debug(f"Found {len(search_results)} matches in {path}")
+                matches.extend(search_results)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
     if skipped_file_error_tuples:
         log.debug(
             f"Failed to read {len(skipped_file_error_tuples)} files. Here the full list of files and errors:\n{skipped_file_error_tuples}"
@@ -0,0 +1,298 @@
+"""
+Tests for the handling of the document symbols cache and of the files opened in the language server.
+
+Each test uses a fresh language server on a copy of the test repository, such that no cached state
+(in memory or persisted in the repository) is shared with other tests.
+"""
+
+import asyncio
+import shutil
+import sqlite3
+import threading
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from multilspy.language_server import LanguageServer, SyncLanguageServer
+from multilspy.multilspy_config import Language, MultilspyConfig
+from multilspy.multilspy_logger import MultilspyLogger
+from test.conftest import get_repo_path
+
+
+def create_ls(repo_path: Path) -> SyncLanguageServer:
+    config = MultilspyConfig(code_language=Language.PYTHON)
+    return SyncLanguageServer.create(config, MultilspyLogger(), str(repo_path))
+
+
+@pytest.fixture
+def repo_copy(tmp_path: Path) -> Path:
+    """A copy of the python test repository without any persisted cache."""
+    repo_path = tmp_path / "test_repo"
+    shutil.copytree(get_repo_path(Language.PYTHON), repo_path, ignore=shutil.ignore_patterns(".serena"))
+    return repo_path
+
+
+@pytest.fixture
+def fresh_ls(repo_copy: Path) -> Generator[SyncLanguageServer, None, None]:
+    ls = create_ls(repo_copy)
+    ls.start()
+    try:
+        yield ls
+    finally:
+        ls.stop()
+
+
+class TestOpenFiles:
+    @staticmethod
+    def _track_peak_num_open_files(ls: LanguageServer) -> list[int]:
+        """
+        :return: a list holding the peak number of files which were open at the same time, which is updated whenever a file is opened
+        """
+        peak_num_open_files = [0]
+        acquire_file_buffer = ls._acquire_file_buffer
+
+        def acquire_file_buffer_and_count(*args, **kwargs):
+            file_buffer = acquire_file_buffer(*args, **kwargs)
+            peak_num_open_files[0] = max(peak_num_open_files[0], len(ls.open_file_buffers))
+            return file_buffer
+
+        ls._acquire_file_buffer = acquire_file_buffer_and_count
+        return peak_num_open_files
+
+    def test_full_symbol_tree_bounds_open_files(self, fresh_ls: SyncLanguageServer) -> None:
+        """Test that building the symbol tree does not keep more files open than symbol requests may be in flight."""
+        ls = fresh_ls.language_server
+        ls.max_concurrent_symbol_requests = 2
+        peak_num_open_files = self._track_peak_num_open_files(ls)
+        tree = fresh_ls.request_full_symbol_tree()
+        assert len(tree) == 1 and tree[0]["children"]
+        # the symbols were not cached, so the files had to be opened
+        assert 0 < peak_num_open_files[0] <= 2
+
+    def test_referencing_symbols_bounds_open_files(self, fresh_ls: SyncLanguageServer) -> None:
+        """Test that the referencing files are not all opened at once when looking up the symbols referencing a symbol."""
+        ls = fresh_ls.language_server
+        ls.max_concurrent_symbol_requests = 1
+        file_path = str(Path("test_repo") / "models.py")
+        symbols = fresh_ls.request_document_symbols(file_path)
+        sel_start = next(s for s in symbols[0] if s.get("name") == "User")["selectionRange"]["start"]
+        references = fresh_ls.request_references(file_path, sel_start["line"], sel_start["character"])
+        assert len({ref["relativePath"] for ref in references}) > 1
+        peak_num_open_files = self._track_peak_num_open_files(ls)
+        ref_symbols = fresh_ls.request_referencing_symbols(file_path, sel_start["line"], sel_start["character"])
+        assert ref_symbols
+        assert peak_num_open_files[0] == 1
+
+
+class TestLingeringFileBuffers:
+    def test_unmodified_buffers_are_kept_open(self, fresh_ls: SyncLanguageServer, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that files which are opened repeatedly are opened only once and that the least recently used buffers are closed."""
+        ls = fresh_ls.language_server
+        ls.max_lingering_file_buffers = 2
+        did_open_text_document = ls.server.notify.did_open_text_document
+        opened_uris = []
+
+        def recording_did_open_text_document(params):
+            opened_uris.append(params["textDocument"]["uri"])
+            did_open_text_document(params)
+
+        monkeypatch.setattr(ls.server.notify, "did_open_text_document", recording_did_open_text_document)
+        file_paths = [str(Path("test_repo") / name) for name in ["models.py", "services.py", "utils.py"]]
+        for file_path in file_paths[:2] * 2:
+            with fresh_ls.open_file(file_path):
+                pass
+        assert len(opened_uris) == 2
+        assert list(ls._lingering_file_buffer_uris) == opened_uris
+        assert all(ls.open_file_buffers[uri].ref_count == 0 for uri in opened_uris)
+
+        with fresh_ls.open_file(file_paths[2]):
+            pass
+        assert len(opened_uris) == 3
+        assert list(ls._lingering_file_buffer_uris) == opened_uris[1:]
+        assert list(ls.open_file_buffers) == opened_uris[1:]
+
+    def test_changed_file_is_not_read_from_lingering_buffer(self, fresh_ls: SyncLanguageServer, repo_copy: Path) -> None:
+        """Test that the contents of a file which changed on disk are not taken from its lingering buffer, which is closed."""
+        ls = fresh_ls.language_server
+        ls.max_lingering_file_buffers = 2
+        file_path = str(Path("test_repo") / "models.py")
+        with fresh_ls.open_file(file_path) as file_buffer:
+            uri = file_buffer.uri
+            contents = file_buffer.contents
+        assert uri in ls._lingering_file_buffer_uris
+        assert fresh_ls.retrieve_full_file_content(file_path) == contents
+
+        modified_contents = contents + "\nNEW_CONSTANT = 1\n"
+        (repo_copy / file_path).write_text(modified_contents)
+        assert fresh_ls.retrieve_full_file_content(file_path) == modified_contents
+        assert ls._read_file_lines(file_path)[-2] == "NEW_CONSTANT = 1"
+        # the stale buffer is closed on the event loop, after the callbacks which are already scheduled
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), fresh_ls.loop).result(timeout=fresh_ls.timeout)
+        assert uri not in ls.open_file_buffers
+        assert uri not in ls._lingering_file_buffer_uris
+
+        with fresh_ls.open_file(file_path) as file_buffer:
+            assert file_buffer.contents == modified_contents
+
+
+class TestMissingResponses:
+    def test_missing_response_is_not_cached(self, fresh_ls: SyncLanguageServer, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a missing response of the server is not cached, such that the symbols are requested again."""
+        ls = fresh_ls.language_server
+        file_path = str(Path("test_repo") / "models.py")
+        document_symbol = ls.server.send.document_symbol
+
+        async def no_document_symbols(params):
+            return None
+
+        monkeypatch.setattr(ls.server.send, "document_symbol", no_document_symbols)
+        assert fresh_ls.request_document_symbols(file_path) == ([], [])
+        assert f"{file_path}-False" not in ls._document_symbols_cache
+
+        monkeypatch.setattr(ls.server.send, "document_symbol", document_symbol)
+        all_symbols, root_symbols = fresh_ls.request_document_symbols(file_path)
+        assert root_symbols
+
+
+class TestCacheLookups:
+    def test_entry_is_looked_up_once_per_request(self, fresh_ls: SyncLanguageServer, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that request_document_symbols looks up the cache entry only once, also if there is no such entry."""
+        ls = fresh_ls.language_server
+        cache_get = ls._cache_get
+        looked_up_cache_keys = []
+
+        async def recording_cache_get(cache_key: str):
+            looked_up_cache_keys.append(cache_key)
+            return await cache_get(cache_key)
+
+        monkeypatch.setattr(ls, "_cache_get", recording_cache_get)
+        file_path = str(Path("test_repo") / "models.py")
+        cache_key = ls._get_document_symbols_cache_key(file_path, False)
+        symbols = fresh_ls.request_document_symbols(file_path)
+        assert looked_up_cache_keys == [cache_key]
+        # the file did not change, so the entry is returned without opening the file
+        assert fresh_ls.request_document_symbols(file_path) == symbols
+        assert looked_up_cache_keys == [cache_key, cache_key]
+
+
+class TestPersistence:
+    def test_cache_is_persisted_and_closed_on_stop(self, repo_copy: Path) -> None:
+        """Test that the cache is saved and closed on stop and that a new language server loads its entries from the database."""
+        file_path = str(Path("test_repo") / "models.py")
+        ls = create_ls(repo_copy)
+        ls.start()
+        symbols = ls.request_document_symbols(file_path)
+        ls.stop()
+        assert ls.language_server._cache_connection is None
+        # closing the connection removes SQLite's temporary files (-wal, -shm)
+        cache_files = list((repo_copy / ".serena" / "cache").iterdir())
+        assert [f.suffix for f in cache_files] == [".sqlite"]
+
+        ls = create_ls(repo_copy)
+        ls.start()
+        try:
+            assert not ls.language_server._document_symbols_cache
+            assert ls.request_document_symbols(file_path) == symbols
+            # the entry was loaded from the database
+            assert f"{file_path}-False" in ls.language_server._document_symbols_cache
+        finally:
+            ls.stop()
+
+
+    def test_cache_is_saved_during_shutdown(self, repo_copy: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the unsaved entries are taken on the event loop and written by a separate thread during the shutdown."""
+        file_path = str(Path("test_repo") / "models.py")
+        ls = create_ls(repo_copy)
+        ls.start()
+        ls.request_document_symbols(file_path)
+        loop_thread = ls.loop_thread
+        take_unsaved_cache_entries = ls.language_server._take_unsaved_cache_entries
+        write_cache_entries = ls.language_server._write_cache_entries
+        taking_threads = []
+        writing_threads = []
+
+        def recording_take_unsaved_cache_entries():
+            taking_threads.append(threading.current_thread())
+            return take_unsaved_cache_entries()
+
+        def recording_write_cache_entries(*args):
+            writing_threads.append(threading.current_thread())
+            return write_cache_entries(*args)
+
+        monkeypatch.setattr(ls.language_server, "_take_unsaved_cache_entries", recording_take_unsaved_cache_entries)
+        monkeypatch.setattr(ls.language_server, "_write_cache_entries", recording_write_cache_entries)
+        ls.stop()
+        assert taking_threads == [loop_thread]
+        assert [thread.name for thread in writing_threads] == ["save-document-symbols-cache"]
+        assert not ls.language_server._dirty_cache_keys
+        with sqlite3.connect(ls.language_server._cache_path) as connection:
+            cache_keys = [row[0] for row in connection.execute("SELECT cache_key FROM document_symbols")]
+        assert f"{file_path}-False" in cache_keys
+
+
+    def test_persisted_entry_is_loaded_without_blocking_the_event_loop(self, repo_copy: Path) -> None:
+        """Test that an entry is loaded from the database in a separate thread, which may wait for a save holding the lock."""
+        file_path = str(Path("test_repo") / "models.py")
+        ls = create_ls(repo_copy)
+        ls.start()
+        symbols = ls.request_document_symbols(file_path)
+        ls.stop()
+
+        ls = create_ls(repo_copy)
+        ls.start()
+        try:
+            # the lock is held as by a save of the cache, such that the entry cannot be loaded until it is released
+            with ls.language_server._cache_lock:
+                symbols_future = ls.request_document_symbols_async(file_path)
+                # the event loop keeps serving other coroutines in the meantime
+                asyncio.run_coroutine_threadsafe(asyncio.sleep(0.1), ls.loop).result(timeout=5)
+                assert not symbols_future.done()
+            assert symbols_future.result(timeout=ls.timeout) == symbols
+            assert f"{file_path}-False" in ls.language_server._used_cache_keys
+        finally:
+            ls.stop()
+
+
+class TestEviction:
+    @staticmethod
+    def _wait_for_cache_flush(ls: SyncLanguageServer) -> None:
+        async def wait_for_cache_flush() -> None:
+            if ls.language_server._cache_flush_task is not None:
+                await ls.language_server._cache_flush_task
+
+        asyncio.run_coroutine_threadsafe(wait_for_cache_flush(), ls.loop).result(timeout=ls.timeout)
+
+    def test_least_recently_used_entries_are_evicted_and_reloaded(self, fresh_ls: SyncLanguageServer) -> None:
+        """
+        Test that the least recently used entries are evicted (after being saved in the background, not on the event loop)
+        and are loaded from the persistent cache when they are requested again.
+        """
+        ls = fresh_ls.language_server
+        ls.max_cached_document_symbols = 2
+        save_cache = ls.save_cache
+        num_save_cache_calls = 0
+
+        def counting_save_cache() -> None:
+            nonlocal num_save_cache_calls
+            num_save_cache_calls += 1
+            save_cache()
+
+        ls.save_cache = counting_save_cache
+        file_paths = [str(Path("test_repo") / name) for name in ["models.py", "services.py", "utils.py"]]
+        cache_keys = [ls._get_document_symbols_cache_key(file_path, False) for file_path in file_paths]
+        symbols = [fresh_ls.request_document_symbols(file_path) for file_path in file_paths[:2]]
+        # using the first entry again makes the second one the least recently used entry
+        assert fresh_ls.request_document_symbols(file_paths[0]) == symbols[0]
+        symbols.append(fresh_ls.request_document_symbols(file_paths[2]))
+        self._wait_for_cache_flush(fresh_ls)
+
+        assert list(ls._document_symbols_cache) == [cache_keys[0], cache_keys[2]]
+        assert num_save_cache_calls == 0
+        with sqlite3.connect(ls._cache_path) as connection:
+            persisted_cache_keys = {row[0] for row in connection.execute("SELECT cache_key FROM document_symbols")}
+        assert persisted_cache_keys == set(cache_keys)
+
+        assert fresh_ls.request_document_symbols(file_paths[1]) == symbols[1]
+        assert cache_keys[1] in ls._used_cache_keys
+        assert list(ls._document_symbols_cache) == [cache_keys[2], cache_keys[1]]
@@ -5,6 +5,7 @@ These tests validate the functionality of the language server APIs
 like request_references using the test repository.
 """
 
+import asyncio
 import os
 
 import pytest
@@ -77,6 +78,146 @@ class TestLanguageServerBasics:
         references = language_server.request_references(file_path, sel_start["line"], sel_start["character"])
         assert len(references) > 1, "Should get valid references for create_user (using selectionRange if present)"
 
+    @pytest.mark.parametrize("language_server", [Language.PYTHON], indirect=True)
+    def test_request_references_coalesced(self, language_server: SyncLanguageServer, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that identical requests in flight at the same time are sent once and that each caller gets its own response."""
+        file_path = os.path.join("test_repo", "models.py")
+        symbols = language_server.request_document_symbols(file_path)
+        sel_start = next(s for s in symbols[0] if s.get("name") == "User")["selectionRange"]["start"]
+        position = (file_path, sel_start["line"], sel_start["character"])
+        expected_references = language_server.request_references(*position)
+
+        send_references_request = language_server.language_server._send_references_request
+        num_sent_requests = 0
+        raw_responses = []
+
+        async def counting_send_references_request(*args, **kwargs):
+            nonlocal num_sent_requests
+            num_sent_requests += 1
+            # the response is delayed, such that the other requests are submitted while this one is in flight
+            await asyncio.sleep(0.5)
+            response = await send_references_request(*args, **kwargs)
+            raw_responses.append(response)
+            return response
+
+        def run_concurrently(*coros):
+            async def gather():
+                return await asyncio.gather(*coros)
+
+            return asyncio.run_coroutine_threadsafe(gather(), language_server.loop).result(timeout=language_server.timeout)
+
+        monkeypatch.setattr(language_server.language_server, "_send_references_request", counting_send_references_request)
+        references = run_concurrently(*(language_server.language_server.request_references(*position) for _ in range(3)))
+        assert references == [expected_references] * 3
+        assert num_sent_requests == 1
+
+        # each caller gets a copy of the shared response, such that modifications do not affect the other callers
+        responses = run_concurrently(
+            *(language_server.language_server._send_coalesced_request("key", lambda: counting_send_references_request(*position))
+              for _ in range(2))
+        )
+        assert num_sent_requests == 2
+        assert responses[0] == responses[1] == raw_responses[-1]
+        assert responses[0] is not responses[1]
+        assert all(response is not raw_responses[-1] for response in responses)
+
+    @pytest.mark.parametrize("language_server", [Language.PYTHON], indirect=True)
+    def test_request_references_with_content(self, language_server: SyncLanguageServer, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the lines containing the references are returned without opening the referencing files."""
+        file_path = os.path.join("test_repo", "models.py")
+        symbols = language_server.request_document_symbols(file_path)
+        sel_start = next(s for s in symbols[0] if s.get("name") == "User")["selectionRange"]["start"]
+        references = language_server.request_references(file_path, sel_start["line"], sel_start["character"])
+
+        def open_files_not_expected(*args, **kwargs):
+            raise AssertionError("the referencing files should not be opened")
+
+        monkeypatch.setattr(language_server.language_server, "_open_files", open_files_not_expected)
+        matches = language_server.request_references_with_content(file_path, sel_start["line"], sel_start["character"], 1, 1)
+        assert len(matches) == len(references)
+        for match, reference in zip(matches, references, strict=True):
+            assert match.source_file_path == reference["relativePath"]
+            assert len(match.matched_lines) == 1
+            assert match.matched_lines[0].line_number == reference["range"]["start"]["line"]
+            assert "User" in match.matched_lines[0].line_content
+
+    @pytest.mark.parametrize("language_server", [Language.PYTHON], indirect=True)
+    def test_request_completions_stops_retrying_stalled_incomplete_results(
+        self, language_server: SyncLanguageServer, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that incomplete completions are requested again only while the number of items keeps changing."""
+        file_path = os.path.join("test_repo", "models.py")
+        num_requests = 0
+        num_items_per_request: list[int] = []
+
+        async def incomplete_completion(params):
+            nonlocal num_requests
+            num_items = num_items_per_request[min(num_requests, len(num_items_per_request) - 1)]
+            num_requests += 1
+            items = [{"label": f"item{i}", "insertText": f"item{i}", "kind": 6} for i in range(num_items)]
+            return {"isIncomplete": True, "items": items}
+
+        monkeypatch.setattr(language_server.language_server.server.send, "completion", incomplete_completion)
+        language_server.loop.call_soon_threadsafe(language_server.language_server.completions_available.set)
+
+        # the number of items stalls after the first response
+        num_items_per_request = [2]
+        completions = language_server.request_completions(file_path, 0, 0, allow_incomplete=True)
+        assert num_requests == 3
+        assert [c["completionText"] for c in completions] == ["item0", "item1"]
+        assert language_server.request_completions(file_path, 0, 0) == []
+
+        # the number of items keeps changing, so the results are requested again up to the retry limit
+        num_requests = 0
+        num_items_per_request = list(range(40))
+        language_server.request_completions(file_path, 0, 0)
+        assert num_requests == 30
+
+    @pytest.mark.parametrize("language_server", [Language.PYTHON], indirect=True)
+    def test_request_references_many(self, language_server: SyncLanguageServer) -> None:
+        """Test that request_references_many returns the same references as individual request_references calls."""
+        file_path = os.path.join("test_repo", "models.py")
+        symbols = language_server.request_document_symbols(file_path)
+        positions = []
+        for name in ["User", "Item", "User"]:
+            symbol = next(s for s in symbols[0] if s.get("name") == name)
+            sel_start = symbol["selectionRange"]["start"]
+            positions.append((file_path, sel_start["line"], sel_start["character"]))
+        references_many = language_server.request_references_many(positions)
+        assert references_many == [language_server.request_references(*position) for position in positions]
+        assert len(references_many[0]) > 1
+
+    @pytest.mark.parametrize("language_server", [Language.PYTHON], indirect=True)
+    def test_request_definition_many(self, language_server: SyncLanguageServer) -> None:
+        """Test that request_definition_many returns the same definitions as individual request_definition calls."""
+        file_path = os.path.join("test_repo", "services.py")
+        symbols = language_server.request_document_symbols(file_path)
+        positions = []
+        for name in ["create_user", "get_user", "create_user"]:
+            symbol = next(s for s in symbols[0] if s.get("name") == name)
+            sel_start = symbol["selectionRange"]["start"]
+            positions.append((file_path, sel_start["line"], sel_start["character"]))
+        definitions_many = language_server.request_definition_many(positions)
+        assert definitions_many == [language_server.request_definition(*position) for position in positions]
+        assert all(len(definitions) > 0 for definitions in definitions_many)
+
+    @pytest.mark.parametrize("language_server", [Language.PYTHON], indirect=True)
+    def test_request_async_variants(self, language_server: SyncLanguageServer) -> None:
+        """Test that the *_async variants, submitted together, return the same results as the blocking calls."""
+        file_path = os.path.join("test_repo", "models.py")
+        symbols = language_server.request_document_symbols(file_path)
+        positions = []
+        # the repeated position exercises the coalescing of identical requests which are in flight at the same time
+        for name in ["User", "Item", "User"]:
+            symbol = next(s for s in symbols[0] if s.get("name") == name)
+            sel_start = symbol["selectionRange"]["start"]
+            positions.append((file_path, sel_start["line"], sel_start["character"]))
+        hover_futures = [language_server.request_hover_async(*position) for position in positions]
+        references_futures = [language_server.request_references_async(*position) for position in positions]
+        assert [f.result() for f in hover_futures] == [language_server.request_hover(*position) for position in positions]
+        assert [f.result() for f in references_futures] == [language_server.request_references(*position) for position in positions]
+        assert language_server.request_document_symbols_async(file_path).result() == symbols
+
     @pytest.mark.parametrize("language_server", [Language.PYTHON], indirect=True)
     def test_retrieve_content_around_line(self, language_server: SyncLanguageServer) -> None:
         """Test retrieve_content_around_line functionality with various scenarios."""
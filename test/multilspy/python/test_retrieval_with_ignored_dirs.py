@@ -74,3 +74,39 @@ def test_refs_and_symbols_with_glob_patterns(repo_path: Path) -> None:
 
     references = ls.request_references(definition_file, definition_line, definition_col)
     assert not any("scripts" in ref["relativePath"] for ref in references)
+
+
+def test_ignored_path_with_negation_pattern(tmp_path: Path) -> None:
+    """Tests that the decision for a path re-included by a negation pattern does not depend on whether its directory was checked before."""
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "keep.py").write_text("x = 1\n")
+    (tmp_path / "build" / "other.py").write_text("y = 2\n")
+    config = MultilspyConfig(code_language=Language.PYTHON, ignored_paths=["build/", "!build/keep.py"])
+
+    def create_ls() -> SyncLanguageServer:
+        return SyncLanguageServer.create(config, MultilspyLogger(), str(tmp_path), add_gitignore_content_to_config=False)
+
+    ls = create_ls()
+    assert not ls.is_ignored_path("build/keep.py")
+    assert ls.is_ignored_path("build/other.py")
+
+    ls = create_ls()
+    assert ls.is_ignored_path("build")
+    assert not ls.is_ignored_path("build/keep.py")
+    assert ls.is_ignored_path("build/other.py")
+
+
+def test_ignored_path_decision_follows_file_type(tmp_path: Path) -> None:
+    """Tests that a memoized decision is not reused for a path which was deleted or replaced by a directory."""
+    (tmp_path / "data.txt").write_text("x = 1\n")
+    config = MultilspyConfig(code_language=Language.PYTHON)
+    ls = SyncLanguageServer.create(config, MultilspyLogger(), str(tmp_path), add_gitignore_content_to_config=False)
+    # the file is not a python source file
+    assert ls.is_ignored_path("data.txt")
+
+    (tmp_path / "data.txt").unlink()
+    with pytest.raises(FileNotFoundError):
+        ls.is_ignored_path("data.txt")
+
+    (tmp_path / "data.txt").mkdir()
+    assert not ls.is_ignored_path("data.txt")
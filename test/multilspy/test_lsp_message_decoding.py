@@ -0,0 +1,39 @@
+"""
+Tests for the decoding of the messages received from the language servers, with and without the optional orjson package.
+"""
+
+import math
+
+import pytest
+
+from multilspy.lsp_protocol_handler import server
+
+
+@pytest.fixture(params=["orjson", "json"])
+def decoder(request, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Selects the decoder used by server._decode_json: orjson (if installed) or the standard json module."""
+    if request.param == "orjson":
+        monkeypatch.setattr(server, "orjson", pytest.importorskip("orjson"))
+    else:
+        monkeypatch.setattr(server, "orjson", None)
+    return request.param
+
+
+class TestDecodeJson:
+    def test_decode_message(self, decoder: str) -> None:
+        body = '{"jsonrpc": "2.0", "id": 1, "result": [{"name": "Ünïcode", "kind": 5, "deprecated": false, "data": null}]}'
+        assert server._decode_json(body.encode(server.ENCODING)) == {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "result": [{"name": "Ünïcode", "kind": 5, "deprecated": False, "data": None}],
+        }
+
+    def test_decode_values_rejected_by_orjson(self, decoder: str) -> None:
+        """Test that values which only the standard decoder accepts are decoded regardless of the decoder."""
+        result = server._decode_json(b'{"big": 123456789012345678901234567890, "nan": NaN}')
+        assert result["big"] == 123456789012345678901234567890
+        assert math.isnan(result["nan"])
+
+    def test_decode_invalid_message(self, decoder: str) -> None:
+        with pytest.raises(ValueError):
+            server._decode_json(b'{"jsonrpc": "2.0", "id": 1,')
@@ -347,3 +347,45 @@ class TestSearchFiles:
         assert result.lines[1].match_type == LineType.MATCH
         assert result.lines[2].line_content == "Line after 1", "Incorrect 'after' context line"
         assert result.lines[2].match_type == LineType.AFTER_MATCH
+
+    def test_search_files_concurrent_reads(self):
+        """Test that reading the files with multiple workers yields the same results in the same order, skipping unreadable files."""
+
+        def numbered_mock_reader(file_path: str) -> str:
+            if file_path == "unreadable.txt":
+                raise OSError("cannot read")
+            return f"header\nmatch in {file_path}\nfooter"
+
+        file_paths = [f"file_{i}.txt" for i in range(20)] + ["unreadable.txt"]
+
+        sequential_results = search_files(file_paths=file_paths, pattern="match", file_reader=numbered_mock_reader)
+        concurrent_results = search_files(file_paths=file_paths, pattern="match", file_reader=numbered_mock_reader, max_workers=4)
+
+        assert [result.source_file_path for result in concurrent_results] == [f"file_{i}.txt" for i in range(20)]
+        assert concurrent_results == sequential_results
+
+    def test_search_files_bounds_read_ahead(self, monkeypatch):
+        """Test that the files are not read further ahead of the search than the bounded window of pending reads allows."""
+        import serena.text_utils
+
+        num_searched_files = 0
+        max_read_ahead = 0
+        search_text = serena.text_utils.search_text
+
+        def counting_search_text(*args, **kwargs):
+            nonlocal num_searched_files
+            num_searched_files += 1
+            return search_text(*args, **kwargs)
+
+        def read_ahead_tracking_reader(file_path: str) -> str:
+            nonlocal max_read_ahead
+            max_read_ahead = max(max_read_ahead, int(file_path.split("_")[1]) - num_searched_files)
+            return f"match in {file_path}"
+
+        monkeypatch.setattr(serena.text_utils, "search_text", counting_search_text)
+        file_paths = [f"file_{i}" for i in range(100)]
+        results = search_files(file_paths=file_paths, pattern="match", file_reader=read_ahead_tracking_reader, max_workers=2)
+
+        assert len(results) == 100
+        assert num_searched_files == 100
+        assert 0 < max_read_ahead <= 4